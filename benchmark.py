@@ -0,0 +1,484 @@
+import random
+import sys
+import time
+import tracemalloc
+
+from v4 import (BST, BSTNode, ArrayBST, BTree, HashTable, SkipList, SplayTree, TREE_BACKENDS,
+                FROZEN_LAYOUTS, BTREE_ORDERS, HASH_BACKENDS, PROBE_STRATEGIES)
+
+# Reference copy of the original recursive BST, kept for side-by-side timings
+class RecursiveBST:
+    def __init__(self):
+        self.root = None
+
+    def insert(self, key):
+        def _insert(node, key):
+            if not node:
+                return BSTNode(key)
+            elif key < node.key:
+                node.left = _insert(node.left, key)
+            else:
+                node.right = _insert(node.right, key)
+            return node
+        self.root = _insert(self.root, key)
+
+    def search(self, key):
+        def _search(node, key):
+            if not node:
+                return False
+            if node.key == key:
+                return True
+            elif key < node.key:
+                return _search(node.left, key)
+            else:
+                return _search(node.right, key)
+        return _search(self.root, key)
+
+
+class DictBSTNode:
+    """BSTNode with a per-instance __dict__ instead of __slots__, for memory comparisons."""
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.count = 1
+
+
+def time_per_op(func, items):
+    """Run func over items and return the average time per call in microseconds."""
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / max(1, len(items)) * 1e6
+
+
+def bench_bst_engines(sizes=(1000, 10000, 100000), degenerate_sizes=(500, 2000, 5000)):
+    """Compare per-op latency of the recursive closures and the iterative BST."""
+    print("== Recursive vs iterative BST (microseconds per op) ==")
+    print(f"{'input':<10}{'n':>8}{'engine':>12}{'insert':>12}{'search':>12}")
+    cases = [("random", n, random.sample(range(n * 10), n)) for n in sizes]
+    cases += [("sorted", n, list(range(n))) for n in degenerate_sizes]
+
+    for label, n, keys in cases:
+        probes = random.sample(keys, min(len(keys), 1000))
+        for name, cls in (("recursive", RecursiveBST), ("iterative", BST)):
+            tree = cls()
+            try:
+                insert_us = time_per_op(tree.insert, keys)
+                search_us = time_per_op(tree.search, probes)
+                print(f"{label:<10}{n:>8}{name:>12}{insert_us:>12.2f}{search_us:>12.2f}")
+            except RecursionError:
+                print(f"{label:<10}{n:>8}{name:>12}{'RecursionError':>24}")
+
+
+def bench_tree_backends(n=20000):
+    """Insert throughput and lookup latency for every tree backend on random and sorted input."""
+    print("\n== Tree backends ==")
+    print(f"{'input':<10}{'backend':<18}{'n':>8}{'inserts/s':>12}{'lookup us':>12}{'height':>8}")
+    for label, keys in (("random", random.sample(range(n * 10), n)), ("sorted", list(range(n)))):
+        probes = random.sample(keys, min(n, 2000))
+        for name, cls in TREE_BACKENDS.items():
+            if label == "sorted" and cls in (BST, ArrayBST) and n > 5000:
+                # The unbalanced tree degrades to a list here; shrink it to keep the run short
+                keys_used = keys[:5000]
+                probes_used = random.sample(keys_used, min(len(keys_used), 2000))
+            else:
+                keys_used, probes_used = keys, probes
+            tree = cls()
+            insert_us = time_per_op(tree.insert, keys_used)
+            search_us = time_per_op(tree.search, probes_used)
+            print(f"{label:<10}{name:<18}{len(keys_used):>8}{1e6 / insert_us:>12,.0f}"
+                  f"{search_us:>12.2f}{tree.height():>8}")
+
+
+def rebuild_balance(tree):
+    """The previous BST.balance: collect every key, then build a fresh node per key."""
+    keys = []
+    tree.inorder_traversal(tree.root, keys)
+    tree.root = tree._build_balanced(keys)
+    # The cached depth histogram describes the old shape
+    tree.depth_counts = None
+
+
+def bench_balance_memory(n=200000):
+    """Peak extra memory and time of the list-and-rebuild balance versus in-place DSW."""
+    print(f"\n== Balancing a {n:,}-node random tree ==")
+    print(f"{'method':<14}{'peak KiB':>12}{'seconds':>10}{'height':>8}")
+    keys = random.sample(range(n * 10), n)
+    for name, balance in (("rebuild", rebuild_balance), ("dsw in-place", BST.balance)):
+        tree = BST()
+        for key in keys:
+            tree.insert(key)
+        tracemalloc.start()
+        start = time.perf_counter()
+        balance(tree)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<14}{peak / 1024:>12,.0f}{elapsed:>10.2f}{tree.height():>8}")
+
+
+def bench_node_memory(n=100000):
+    """Traced bytes per node for the __dict__ node layout versus the slotted BSTNode."""
+    print(f"\n== Node memory, {n:,} nodes ==")
+    for name, cls in (("__dict__", DictBSTNode), ("__slots__", BSTNode)):
+        tracemalloc.start()
+        nodes = [cls(key) for key in range(n)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Subtract the list holding the nodes so only the node objects are counted
+        per_node = (current - sys.getsizeof(nodes)) / n
+        print(f"{name:<12}{per_node:>8.1f} bytes/node")
+        del nodes
+
+    keys = random.sample(range(n * 10), n)
+    tracemalloc.start()
+    tree = ArrayBST()
+    for key in keys:
+        tree.insert(key)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'ArrayBST':<12}{current / n:>8.1f} bytes/node (including array over-allocation)")
+
+
+def zipf_probes(keys, count, s=1.1):
+    """Draw count lookups where the i-th most popular key has weight 1/i**s."""
+    popularity = random.sample(keys, len(keys))
+    weights = [1 / rank ** s for rank in range(1, len(popularity) + 1)]
+    return random.choices(popularity, weights=weights, k=count)
+
+
+def bench_skewed_lookups(n=50000, lookups=100000):
+    """Amortized lookup cost of the splay tree versus BST and HashTable under skewed access."""
+    print(f"\n== Skewed lookups, n={n:,}, {lookups:,} lookups (microseconds per lookup) ==")
+    keys = random.sample(range(n * 10), n)
+    workloads = (
+        ("uniform", [random.choice(keys) for _ in range(lookups)]),
+        ("zipf s=1.1", zipf_probes(keys, lookups)),
+        ("repeated", [random.choice(keys)] * lookups),
+    )
+    structures = (("BST", BST), ("Splay Tree", SplayTree), ("Hash Table", HashTable))
+    print(f"{'workload':<14}" + "".join(f"{name:>14}" for name, _ in structures))
+    for label, probes in workloads:
+        row = f"{label:<14}"
+        for _, cls in structures:
+            structure = cls()
+            for key in keys:
+                structure.insert(key)
+            row += f"{time_per_op(structure.search, probes):>14.2f}"
+        print(row)
+
+
+def bench_bulk_insert(sizes=(10000, 100000, 1000000)):
+    """Wall time of loading n random keys one insert at a time versus a single bulk_insert."""
+    print("\n== Bulk loading (seconds) ==")
+    print(f"{'n':>10}{'insert loop':>14}{'bulk_insert':>14}{'loop height':>13}{'bulk height':>13}")
+    for n in sizes:
+        keys = random.sample(range(n * 10), n)
+        looped = BST()
+        start = time.perf_counter()
+        for key in keys:
+            looped.insert(key)
+        loop_seconds = time.perf_counter() - start
+
+        bulk = BST()
+        start = time.perf_counter()
+        bulk.bulk_insert(keys)
+        bulk_seconds = time.perf_counter() - start
+        print(f"{n:>10,}{loop_seconds:>14.2f}{bulk_seconds:>14.2f}{looped.height():>13}{bulk.height():>13}")
+
+
+def bench_search_many(n=200000, batch_sizes=(100, 1000, 10000, 100000)):
+    """Per-key cost of independent search calls versus one search_many over the same batch."""
+    print(f"\n== Batched lookups, n={n:,} (microseconds per key) ==")
+    print(f"{'backend':<12}{'batch':>10}{'search':>10}{'search_many':>13}{'speedup':>10}")
+    keys = random.sample(range(n * 10), n)
+    for name, cls in (("BST", BST), ("Array BST", ArrayBST)):
+        tree = cls()
+        tree.bulk_insert(keys)
+        for size in batch_sizes:
+            probes = random.sample(keys, size // 2) + random.sample(range(n * 10), size - size // 2)
+            single_us = time_per_op(tree.search, probes)
+            start = time.perf_counter()
+            tree.search_many(probes)
+            batched_us = (time.perf_counter() - start) / size * 1e6
+            print(f"{name:<12}{size:>10,}{single_us:>10.2f}{batched_us:>13.2f}{single_us / batched_us:>9.1f}x")
+
+
+def bench_iteration_memory(n=200000):
+    """Peak extra memory and time of collecting every key into a list versus iterating lazily."""
+    print(f"\n== Full in-order scan of a {n:,}-node random tree ==")
+    print(f"{'method':<20}{'peak KiB':>12}{'seconds':>10}")
+    tree = BST()
+    for key in random.sample(range(n * 10), n):
+        tree.insert(key)
+
+    def collect():
+        keys = []
+        tree.inorder_traversal(tree.root, keys)
+        return sum(keys)
+
+    def stream():
+        return sum(tree)
+
+    for name, scan in (("inorder_traversal", collect), ("lazy __iter__", stream)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        scan()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<20}{peak / 1024:>12,.0f}{elapsed:>10.2f}")
+
+
+def bench_auto_rebalance(n=100000):
+    """Sorted inserts into a plain BST under each auto-rebalance policy: total time, rebalance cost, height."""
+    print(f"\n== Auto-rebalance on {n:,} sorted inserts ==")
+    print(f"{'policy':<22}{'seconds':>10}{'fired':>8}{'rebal s':>10}{'height':>8}")
+    policies = (("height > 2*log2(n)", {"height_factor": 2}), ("every 1,000 inserts", {"every": 1000}))
+    for label, policy in policies:
+        tree = BST()
+        tree.set_rebalance_policy(**policy)
+        start = time.perf_counter()
+        for key in range(n):
+            tree.insert(key)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<22}{elapsed:>10.2f}{tree.auto_rebalances:>8,}{tree.auto_rebalance_seconds:>10.2f}"
+              f"{tree.height():>8}")
+
+
+def bench_persistent_insert(sizes=(1000, 10000, 100000), inserts=1000):
+    """Extra memory and time per insert while a snapshot is pinned, versus in-place inserts."""
+    print("\n== Path-copying inserts under a pinned snapshot ==")
+    print(f"{'n':>10}{'height':>8}{'kept B/insert':>15}{'us in-place':>13}{'us copying':>12}")
+    for n in sizes:
+        keys = random.sample(range(n * 10), n)
+        extra = random.sample(range(n * 10, n * 20), inserts)
+        plain = BST()
+        plain.bulk_insert(keys)
+        in_place_us = time_per_op(plain.insert, extra)
+
+        tree = BST()
+        tree.bulk_insert(keys)
+        snapshot = tree.snapshot()
+        copying_us = time_per_op(tree.insert, extra)
+
+        # Superseded path copies are freed as soon as no root reaches them, so what stays
+        # allocated is the snapshot's share plus the new nodes
+        tree = BST()
+        tree.bulk_insert(keys)
+        snapshot = tree.snapshot()
+        tracemalloc.start()
+        for key in extra:
+            tree.insert(key)
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(snapshot) == n
+        print(f"{n:>10,}{tree.height():>8}{used / inserts:>15,.0f}{in_place_us:>13.2f}{copying_us:>12.2f}")
+
+
+def bench_frozen_layouts(sizes=(10000, 100000, 1000000), lookups=100000):
+    """Lookup latency of the pointer-based BST versus the same keys frozen into flat layouts."""
+    print("\n== Pointer tree vs frozen layouts (microseconds per key, half misses) ==")
+    print(f"{'n':>10}{'structure':>14}{'search':>10}{'search_many':>13}")
+    for n in sizes:
+        keys = random.sample(range(n * 10), n)
+        tree = BST()
+        tree.bulk_insert(keys)
+        probes = random.choices(keys, k=lookups // 2) + random.choices(range(n * 10), k=lookups - lookups // 2)
+        random.shuffle(probes)
+        structures = [("BST", tree)] + [(name, tree.freeze(name)) for name in FROZEN_LAYOUTS]
+        for name, structure in structures:
+            start = time.perf_counter()
+            structure.search_many(probes)
+            batched_us = (time.perf_counter() - start) / lookups * 1e6
+            print(f"{n:>10,}{name:>14}{time_per_op(structure.search, probes):>10.2f}{batched_us:>13.2f}")
+
+
+def bench_layout_scaling(sizes=(10000, 100000, 1000000, 10000000), lookups=200000, max_tree=1000000):
+    """How lookup latency grows with n for each frozen layout once the keys outgrow the CPU caches.
+
+    The layouts are built straight from a sorted range, so only sizes up to max_tree also
+    build a pointer BST (a 10M-node tree needs several GB)."""
+    print("\n== Lookup latency vs n (microseconds per key, half misses) ==")
+    print(f"{'n':>12}{'structure':>15}{'MiB':>9}{'search':>10}{'search_many':>13}")
+    for n in sizes:
+        keys = range(0, 2 * n, 2)
+        probes = [random.randrange(2 * n) for _ in range(lookups)]
+        structures = [(name, layout(keys)) for name, layout in FROZEN_LAYOUTS.items()]
+        if n <= max_tree:
+            tree = BST()
+            tree.bulk_insert(keys)
+            structures.insert(0, ("BST", tree))
+        for name, structure in structures:
+            mib = n * (structure.bytes_per_key() if hasattr(structure, "bytes_per_key")
+                       else structure.bytes_per_node()) / 2**20
+            single_us = time_per_op(structure.search, probes[:lookups // 10])
+            start = time.perf_counter()
+            structure.search_many(probes)
+            batched_us = (time.perf_counter() - start) / lookups * 1e6
+            print(f"{n:>12,}{name:>15}{mib:>9,.0f}{single_us:>10.2f}{batched_us:>13.2f}")
+
+
+def bench_skip_list(n=100000, probabilities=(0.25, 0.5, 0.75)):
+    """Skip list insert and lookup cost, tower height and memory for several level probabilities."""
+    print(f"\n== Skip list, {n:,} random keys ==")
+    print(f"{'structure':<16}{'inserts/s':>12}{'lookup us':>12}{'avg tower':>11}{'B/key':>8}")
+    keys = random.sample(range(n * 10), n)
+    probes = random.sample(keys, 20000)
+    tree = BST()
+    insert_us = time_per_op(tree.insert, keys)
+    print(f"{'BST':<16}{1e6 / insert_us:>12,.0f}{time_per_op(tree.search, probes):>12.2f}"
+          f"{'-':>11}{tree.bytes_per_node():>8}")
+    for p in probabilities:
+        skips = SkipList(p=p)
+        insert_us = time_per_op(skips.insert, keys)
+        print(f"{f'skip list p={p}':<16}{1e6 / insert_us:>12,.0f}{time_per_op(skips.search, probes):>12.2f}"
+              f"{skips.average_tower_height():>11.2f}{skips.bytes_per_node():>8}")
+
+
+def bench_btree_orders(n=200000, lookups=100000):
+    """Insert and lookup throughput of B-trees of several orders against the BST and HashTable."""
+    print(f"\n== B-tree orders, {n:,} random keys (operations per second) ==")
+    print(f"{'structure':<16}{'inserts/s':>12}{'lookups/s':>12}{'levels':>8}")
+    keys = random.sample(range(n * 10), n)
+    probes = random.choices(keys, k=lookups)
+    structures = [("BST", BST()), ("Hash Table", HashTable())]
+    structures += [(f"B-Tree {order}", BTree(order=order)) for order in BTREE_ORDERS]
+    for name, structure in structures:
+        insert_us = time_per_op(structure.insert, keys)
+        search_us = time_per_op(structure.search, probes)
+        levels = structure.levels() if isinstance(structure, BTree) else "-"
+        print(f"{name:<16}{1e6 / insert_us:>12,.0f}{1e6 / search_us:>12,.0f}{levels:>8}")
+
+
+def bench_hash_load_factors(n=20000, lookups=20000, max_loads=(0.5, 0.75, 1.0)):
+    """Insert cost, probe length and hit/miss latency of the HashTable at each maximum load factor."""
+    print(f"\n== HashTable max load factor, {n:,} random keys ==")
+    print(f"{'max load':>9}{'size':>9}{'inserts/s':>12}{'avg probe':>11}{'hit us':>9}{'miss us':>9}")
+    keys = random.sample(range(n * 10), n)
+    hits = random.choices(keys, k=lookups)
+    misses = random.choices(range(n * 10, n * 20), k=lookups)
+    for max_load in max_loads:
+        table = HashTable(max_load=max_load)
+        insert_us = time_per_op(table.insert, keys)
+        print(f"{max_load:>9}{table.size:>9,}{1e6 / insert_us:>12,.0f}{table.average_probe_length():>11.2f}"
+              f"{time_per_op(table.search, hits):>9.2f}{time_per_op(table.search, misses):>9.2f}")
+
+
+def bench_resize_latency(n=500000):
+    """Per-insert latency percentiles with blocking versus incremental HashTable resizing."""
+    print(f"\n== HashTable insert latency, {n:,} random keys (microseconds) ==")
+    print(f"{'resize':<13}{'p50':>8}{'p99':>8}{'p99.9':>9}{'max':>11}{'total s':>9}")
+    keys = random.sample(range(n * 10), n)
+    for label, incremental in (("blocking", False), ("incremental", True)):
+        table = HashTable(incremental=incremental)
+        latencies = []
+        for key in keys:
+            start = time.perf_counter()
+            table.insert(key)
+            latencies.append(time.perf_counter() - start)
+        total = sum(latencies)
+        latencies.sort()
+        p50, p99, p999 = (latencies[int(q * (n - 1))] * 1e6 for q in (0.5, 0.99, 0.999))
+        print(f"{label:<13}{p50:>8.2f}{p99:>8.2f}{p999:>9.2f}{latencies[-1] * 1e6:>11,.0f}{total:>9.2f}")
+
+
+def bench_robin_hood(size=102400, loads=(0.5, 0.75, 0.9, 0.95), lookups=20000):
+    """Hit and miss latency of linear versus Robin Hood probing on tables filled to a fixed load."""
+    print(f"\n== Linear vs Robin Hood probing, {size:,} slots (microseconds per lookup) ==")
+    print(f"{'keys':<9}{'load':>6}{'mode':>13}{'avg probe':>11}{'hit us':>9}{'miss us':>9}")
+    for label, stride in (("random", None), ("stride 10", 10)):
+        for load in loads:
+            n = int(size * load)
+            if stride is None:
+                keys = random.sample(range(size * 20), n)
+            else:
+                # Patterned keys: with key % size, only every tenth slot is ever a home slot
+                keys = random.sample(range(0, size * 20 * stride, stride), n)
+            stored = set(keys)
+            hits = random.choices(keys, k=lookups)
+            misses = [key + 1 for key in random.choices(keys, k=lookups) if key + 1 not in stored]
+            for mode, robin_hood in (("linear", False), ("Robin Hood", True)):
+                table = HashTable(size=size, max_load=1.0, robin_hood=robin_hood)
+                for key in keys:
+                    table.insert(key)
+                print(f"{label:<9}{load:>6}{mode:>13}{table.average_probe_length():>11.2f}"
+                      f"{time_per_op(table.search, hits):>9.2f}{time_per_op(table.search, misses):>9.2f}")
+
+
+def bench_hash_backends(n=100000, lookups=50000):
+    """Median and tail lookup latency of every hash backend on hits and misses."""
+    print(f"\n== Hash backends, {n:,} random keys (microseconds per lookup) ==")
+    print(f"{'backend':<16}{'probes':>8}{'hit p50':>9}{'hit p99':>9}{'miss p50':>10}{'miss p99':>10}")
+    keys = random.sample(range(n * 10), n)
+    hits = random.choices(keys, k=lookups)
+    misses = random.choices(range(n * 10, n * 20), k=lookups)
+    for name, cls in HASH_BACKENDS.items():
+        table = cls()
+        for key in keys:
+            table.insert(key)
+        row = f"{name:<16}{table.average_probe_length():>8.2f}"
+        for probes in (hits, misses):
+            latencies = []
+            for key in probes:
+                start = time.perf_counter()
+                table.search(key)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            p50, p99 = (latencies[int(q * (lookups - 1))] * 1e6 for q in (0.5, 0.99))
+            row += f"{p50:>9.2f}{p99:>9.2f}" if probes is hits else f"{p50:>10.2f}{p99:>10.2f}"
+        print(row)
+
+
+def bench_probe_strategies(size=131072, loads=(0.5, 0.75, 0.9), lookups=20000):
+    """Probe lengths and lookup latency of each probe sequence across key distributions."""
+    print(f"\n== Probe sequences, {size:,} slots (microseconds per lookup) ==")
+    print(f"{'keys':<11}{'load':>6}{'probing':>16}{'avg probe':>11}{'hit us':>9}{'miss us':>9}")
+
+    def make_keys(label, n, offset):
+        if label == "random":
+            return random.sample(range(offset, offset + size * 20), n)
+        if label == "sequential":
+            return list(range(offset, offset + n))
+        # Power-of-two stride: key % size only ever lands on every eighth slot
+        return random.sample(range(offset, offset + size * 20 * 8, 8), n)
+
+    for label in ("random", "sequential", "stride 8"):
+        for load in loads:
+            n = int(size * load)
+            keys = make_keys(label, n, 0)
+            hits = random.choices(keys, k=lookups)
+            # Same pattern, but from a range far past every stored key; fewer of them, since a
+            # sequential miss under linear probing walks the whole run of stored keys
+            misses = make_keys(label, lookups // 20, size * 1000)
+            for name, probing in PROBE_STRATEGIES.items():
+                table = HashTable(size=size, max_load=1.0, probing=probing)
+                for key in keys:
+                    table.insert(key)
+                print(f"{label:<11}{load:>6}{name:>16}{table.average_probe_length():>11.2f}"
+                      f"{time_per_op(table.search, hits):>9.2f}{time_per_op(table.search, misses):>9.2f}")
+
+
+if __name__ == "__main__":
+    print(f"Python {sys.version.split()[0]}, recursion limit {sys.getrecursionlimit()}\n")
+    bench_bst_engines()
+    bench_tree_backends()
+    bench_balance_memory()
+    bench_node_memory()
+    bench_skewed_lookups()
+    bench_bulk_insert()
+    bench_search_many()
+    bench_iteration_memory()
+    bench_auto_rebalance()
+    bench_persistent_insert()
+    bench_frozen_layouts()
+    bench_layout_scaling()
+    bench_skip_list()
+    bench_btree_orders()
+    bench_hash_load_factors()
+    bench_resize_latency()
+    bench_robin_hood()
+    bench_hash_backends()
+    bench_probe_strategies()
@@ -7,6 +7,8 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # BST Implementation
 class BSTNode:
+    __slots__ = ("key", "left", "right")
+
     def __init__(self, key):
         self.key = key
         self.left = None
@@ -17,31 +19,44 @@ class BST:
         self.root = None
 
     def insert(self, key):
-        def _insert(node, key):
-            if not node:
-                return BSTNode(key)
-            elif key < node.key:
-                node.left = _insert(node.left, key)
+        new_node = BSTNode(key)
+        if self.root is None:
+            self.root = new_node
+            return
+        # Walk down iteratively so degenerate (sorted) input can't hit the recursion limit
+        node = self.root
+        while True:
+            if key < node.key:
+                if node.left is None:
+                    node.left = new_node
+                    return
+                node = node.left
             else:
-                node.right = _insert(node.right, key)
-            return node
-        self.root = _insert(self.root, key)
+                if node.right is None:
+                    node.right = new_node
+                    return
+                node = node.right
 
     def search(self, key):
-        def _search(node, key):
-            if not node:
-                return False
+        node = self.root
+        while node:
             if node.key == key:
                 return True
-            elif key < node.key:
-                return _search(node.left, key)
-            else:
-                return _search(node.right, key)
-        return _search(self.root, key)
+            node = node.left if key < node.key else node.right
+        return False
 
     def clear(self):
         self.root = None
 
+    def height(self):
+        """Return the number of levels in the tree (0 for an empty tree)."""
+        height = 0
+        level = [self.root] if self.root else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (node.left, node.right) if child]
+        return height
+
 # Hash Table Implementation
 class HashTable:
     def __init__(self, size=100):
@@ -460,12 +475,7 @@ class App:
 
     def update_stats(self):
         # Calculate BST height
-        def get_height(node):
-            if not node:
-                return 0
-            return max(get_height(node.left), get_height(node.right)) + 1
-        
-        height = get_height(self.bst.root)
+        height = self.bst.height()
         
         # Count total items
         count = len(self.values)
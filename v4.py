@@ -1,119 +1,2455 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import gc
+import heapq
+from bisect import bisect_left, bisect_right, insort_right
+from functools import partial
+import math
 import random
+import sys
+import threading
 import time
+import weakref
+from array import array
+from itertools import accumulate, chain, groupby
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from tkinter import font as tkfont
 from tkinter import filedialog
 
+try:
+    import numpy as np
+except ImportError:  # only used to vectorize batched lookups on frozen layouts
+    np = None
+
+# Queries shared by every tree backend
+class OrderedQueries:
+    """Batch lookups, ranges and freezing built on a backend's search and iter_from.
+
+    BST overrides the queries its subtree sizes and node links answer faster. depth_histogram
+    counts the BST-shaped view a backend exposes as root for drawing, caching the counts next to
+    the view in view/view_depths; BST and ArrayBST keep their own histograms.
+    """
+
+    def search_many(self, keys):
+        """Look up a batch of keys and return a list of booleans in the given order."""
+        search = self.search
+        return [search(key) for key in keys]
+
+    def range(self, lo, hi):
+        """Lazily yield the keys in [lo, hi] in sorted order."""
+        for key in self.iter_from(lo):
+            if key > hi:
+                return
+            yield key
+
+    def count_range(self, lo, hi):
+        """Count keys in [lo, hi]; there are no subtree sizes, so this walks the range."""
+        return sum(1 for _ in self.range(lo, hi))
+
+    def inorder_traversal(self, node, result):
+        """Collect keys in order; node is accepted for BST compatibility and ignored."""
+        result.extend(self)
+
+    def freeze(self, layout="Eytzinger"):
+        """Copy the keys into a read-only flat search structure (see FROZEN_LAYOUTS)."""
+        return FROZEN_LAYOUTS[layout](self)
+
+    def depth_histogram(self):
+        """Return the number of view nodes at each depth (see root), counted once per view."""
+        root = self.root
+        if self.view_depths is None or self.view_depths[0] is not self.view:
+            counts = []
+            level = [root] if root else []
+            while level:
+                counts.append(len(level))
+                level = [child for node in level for child in (node.left, node.right) if child]
+            self.view_depths = (self.view, counts)
+        return self.view_depths[1]
+
 # BST Implementation
 class BSTNode:
+    # Slots drop the per-instance __dict__, which dominates the size of a small node
+    __slots__ = ("key", "left", "right", "size", "count")
+
     def __init__(self, key):
         self.key = key
         self.left = None
         self.right = None
+        self.size = 1  # number of keys in this subtree, for rank/select queries
+        self.count = 1  # copies of key held by this node (above 1 only in multiset mode)
         
-class BST:
-    def __init__(self):
+class BST(OrderedQueries):
+    node_class = BSTNode
+
+    def __init__(self, multiset=False):
         self.root = None
+        # In multiset mode a repeated key bumps its node's count instead of adding a node
+        self.multiset = multiset
+        # depth_counts[d] is the number of nodes at depth d; None means it must be recomputed
+        self.depth_counts = []
+        # Automatic rebalancing policy (see set_rebalance_policy) and what it has cost so far
+        self.rebalance_height_factor = None
+        self.rebalance_every = None
+        self.inserts_since_rebalance = 0
+        self.auto_rebalances = 0
+        self.auto_rebalance_seconds = 0.0
+        # While any snapshot is alive, inserts copy their path instead of mutating shared nodes
+        self.live_snapshots = 0
         
     def insert(self, key):
-        def _insert(node, key):
-            if not node:
-                return BSTNode(key)
-            elif key < node.key:
-                node.left = _insert(node.left, key)
+        if self.live_snapshots:
+            self.persistent_insert(key)
+            return
+        new_node = self.node_class(key)
+        if self.root is None:
+            self.root = new_node
+            self._record_depth(0)
+            self._check_rebalance(new_node, 0)
+            return
+        # Walk down iteratively so degenerate (sorted) input can't hit the recursion limit
+        node = self.root
+        depth = 1
+        while True:
+            node.size += 1
+            if self.multiset and key == node.key:
+                node.count += 1
+                return
+            if key < node.key:
+                if node.left is None:
+                    node.left = new_node
+                    break
+                node = node.left
+            else:
+                if node.right is None:
+                    node.right = new_node
+                    break
+                node = node.right
+            depth += 1
+        self._record_depth(depth)
+        self._check_rebalance(new_node, depth)
+
+    def persistent_insert(self, key):
+        """Insert by copying the root-to-leaf path and return the new root; older roots stay valid."""
+        # Only the O(log n) nodes on the path are new; every untouched subtree is shared
+        new_root = copy = self.node_class(key)
+        depth = 0
+        node = self.root
+        parent = None
+        while node:
+            copy = self.node_class(node.key)
+            copy.left, copy.right = node.left, node.right
+            copy.size, copy.count = node.size + 1, node.count
+            if parent is None:
+                new_root = copy
+            elif node is parent.left:
+                parent.left = copy
+            else:
+                parent.right = copy
+            if self.multiset and key == node.key:
+                copy.count += 1
+                self.root = new_root
+                return new_root
+            parent, node = copy, (node.left if key < node.key else node.right)
+            depth += 1
+        if parent is not None:
+            copy = self.node_class(key)
+            if key < parent.key:
+                parent.left = copy
             else:
-                node.right = _insert(node.right, key)
-            return node
-        self.root = _insert(self.root, key)
+                parent.right = copy
+        self.root = new_root
+        # No auto-rebalance here: it relinks nodes the snapshots still share
+        self._record_depth(depth)
+        return new_root
+
+    def snapshot(self):
+        """Pin the current contents as a read-only BSTSnapshot that later inserts leave untouched."""
+        if type(self).insert is not BST.insert:
+            raise TypeError(f"{type(self).__name__} restructures shared nodes and cannot take snapshots")
+        view = BSTSnapshot(self.root)
+        self.live_snapshots += 1
+        weakref.finalize(view, self._release_snapshot)
+        return view
+
+    def _release_snapshot(self):
+        self.live_snapshots -= 1
+
+    def set_rebalance_policy(self, height_factor=None, every=None):
+        """Rebalance whenever a new node lands deeper than height_factor * log2(n), and/or fully every N new nodes."""
+        if height_factor is not None and height_factor < 1:
+            raise ValueError("height_factor must be at least 1")
+        if every is not None and every < 1:
+            raise ValueError("every must be a positive number of inserts")
+        self.rebalance_height_factor = height_factor
+        self.rebalance_every = every
+        self.inserts_since_rebalance = 0
+
+    def _check_rebalance(self, new_node, depth):
+        """Rebalance if the policy says the tree has degraded; new_node just landed at depth."""
+        self.inserts_since_rebalance += 1
+        if self.rebalance_every is not None and self.inserts_since_rebalance >= self.rebalance_every:
+            start = time.perf_counter()
+            self.balance()
+            self._count_rebalance(start)
+        elif (self.rebalance_height_factor is not None
+              and depth > self.rebalance_height_factor * math.log2(self.root.size)):
+            # Only the new node's depth can have grown, so it alone decides whether the bound broke
+            start = time.perf_counter()
+            self._rebuild_deepest_violator(new_node, depth)
+            self._count_rebalance(start)
+
+    def _count_rebalance(self, start):
+        self.auto_rebalance_seconds += time.perf_counter() - start
+        self.auto_rebalances += 1
+        self.inserts_since_rebalance = 0
+
+    def _rebuild_deepest_violator(self, new_node, depth):
+        """Rebuild the deepest ancestor of new_node whose own subtree breaks the height bound."""
+        path = []
+        node = self.root
+        while node is not new_node:
+            path.append(node)
+            node = node.left if new_node.key < node.key else node.right
+        # The root itself breaks the bound, so the walk up always finds an ancestor to rebuild.
+        # Rebuilding the deepest one keeps each fix small, which amortizes to O(log n) per insert
+        # on sorted input instead of a whole-tree balance every few inserts.
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            if depth - i > self.rebalance_height_factor * math.log2(node.size):
+                subtree = self._rebuild_subtree(node, i)
+                if i == 0:
+                    self.root = subtree
+                elif path[i - 1].left is node:
+                    path[i - 1].left = subtree
+                else:
+                    path[i - 1].right = subtree
+                return
+
+    def _record_depth(self, depth):
+        """Count a new node at depth in the histogram, if the histogram is current."""
+        if self.depth_counts is None:
+            return
+        if depth == len(self.depth_counts):
+            self.depth_counts.append(1)
+        else:
+            self.depth_counts[depth] += 1
 
     def search(self, key):
-        def _search(node, key):
-            if not node:
-                return False
+        node = self.root
+        while node:
             if node.key == key:
                 return True
-            elif key < node.key:
-                return _search(node.left, key)
+            node = node.left if key < node.key else node.right
+        return False
+
+    def search_many(self, keys):
+        """Look up a batch of keys in one sorted pass and return a list of booleans in the given order."""
+        keys = list(keys)
+        found = [False] * len(keys)
+        # Finger search: keep the previous probe's path, each node paired with the exclusive
+        # upper bound of its subtree. The next (larger) probe climbs only as far as the first
+        # ancestor whose range still holds it and descends from there, so the shared prefix
+        # of consecutive paths is never walked twice.
+        nodes, uppers = [], []
+        for j in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[j]
+            while uppers and uppers[-1] is not None and key >= uppers[-1]:
+                nodes.pop()
+                uppers.pop()
+            if nodes:
+                node, upper = nodes.pop(), uppers.pop()
             else:
-                return _search(node.right, key)
-        return _search(self.root, key)
+                node, upper = self.root, None
+            while node:
+                nodes.append(node)
+                uppers.append(upper)
+                if node.key == key:
+                    found[j] = True
+                    break
+                if key < node.key:
+                    upper = node.key
+                    node = node.left
+                else:
+                    node = node.right
+        return found
 
     def clear(self):
         self.root = None
+        self.depth_counts = []
+        self.inserts_since_rebalance = 0
+        self.auto_rebalances = 0
+        self.auto_rebalance_seconds = 0.0
+
+    def __len__(self):
+        return self._size(self.root)
+
+    def bytes_per_node(self):
+        """Approximate memory of one node object, not counting the key it holds."""
+        if self.root is None:
+            return 0
+        size = sys.getsizeof(self.root)
+        if hasattr(self.root, "__dict__"):
+            size += sys.getsizeof(self.root.__dict__)
+        return size
+
+    def height(self):
+        """Return the number of levels in the tree (0 for an empty tree)."""
+        return len(self.depth_histogram())
+
+    def depth_histogram(self):
+        """Return the number of nodes at each depth, recounting only if a rebuild invalidated it."""
+        if self.depth_counts is None:
+            self.depth_counts = []
+            level = [self.root] if self.root else []
+            while level:
+                self.depth_counts.append(len(level))
+                level = [child for node in level for child in (node.left, node.right) if child]
+        return self.depth_counts
 
     def inorder_traversal(self, node, result):
         """Helper method to perform an in-order traversal and collect keys."""
-        if node:
-            self.inorder_traversal(node.left, result)
-            result.append(node.key)
-            self.inorder_traversal(node.right, result)
+        stack = []
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                result.extend([node.key] * node.count)
+                node = node.right
+
+    def _build_balanced(self, keys):
+        """Build a balanced subtree from sorted keys and return its root."""
+        counts = None
+        if self.multiset:
+            runs = [(key, sum(1 for _ in group)) for key, group in groupby(keys)]
+            keys = [key for key, _ in runs]
+            counts = [count for _, count in runs]
+            # prefix[i] is the number of stored keys before slot i, so a slice's size is one subtraction
+            prefix = [0]
+            prefix.extend(accumulate(counts))
+
+        root = None
+        built = []
+        # Each entry is (parent, attach_left, start, end, depth) for a slice still to build
+        stack = [(None, False, 0, len(keys) - 1, 0)]
+        while stack:
+            parent, attach_left, start, end, depth = stack.pop()
+            if start > end:
+                continue
+            mid = (start + end) // 2
+            node = self.node_class(keys[mid])
+            if counts:
+                node.count = counts[mid]
+                node.size = prefix[end + 1] - prefix[start]
+            else:
+                node.size = end - start + 1
+            built.append((node, depth))
+            if parent is None:
+                root = node
+            elif attach_left:
+                parent.left = node
+            else:
+                parent.right = node
+            stack.append((node, True, start, mid - 1, depth + 1))
+            stack.append((node, False, mid + 1, end, depth + 1))
+        self._finish_build(built)
+        return root
+
+    def _finish_build(self, built):
+        """Hook for subclasses to fill in their own fields; built lists (node, depth), parents first."""
+
+    def bulk_insert(self, iterable):
+        """Merge a batch of keys into the tree and rebuild it perfectly balanced in one pass."""
+        batch = sorted(iterable)
+        if not batch:
+            return
+        # The tree streams its keys in order, so heapq.merge combines both runs in linear time
+        merged = list(heapq.merge(self, batch))
+        # The build allocates a node per key and none of them form cycles, so pause the
+        # cyclic collector instead of letting it rescan the growing tree over and over
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.root = self._build_balanced(merged)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self.depth_counts = None
 
     def balance(self):
-        """Balance the tree by rebuilding it from a sorted array."""
-        def build_balanced_tree(keys, start, end):
+        """Balance the tree in place with Day-Stout-Warren rotations.
+
+        No nodes are copied; beyond the tree itself only the O(log n) stack of the final size
+        recount is used.
+        """
+        if self.live_snapshots:
+            # Rotations would reshape nodes a snapshot still reads, so build fresh ones instead
+            self.root = self._build_balanced(list(self))
+            self.depth_counts = None
+            return
+        pseudo_root = BSTNode(None)
+        pseudo_root.right = self.root
+
+        # Phase 1: rotate everything into a right-leaning "vine" in sorted order. Rotations in
+        # both phases only relink nodes: keeping subtree sizes current would hand every vine node
+        # a fresh large int, so the sizes are recounted in one pass at the end instead
+        tail = pseudo_root
+        rest = tail.right
+        size = 0
+        while rest:
+            if rest.left is None:
+                tail = rest
+                rest = rest.right
+                size += 1
+            else:
+                pivot = rest.left
+                rest.left = pivot.right
+                pivot.right = rest
+                rest = pivot
+                tail.right = rest
+
+        # Phase 2: compress the vine with left rotations, bottom level first
+        leaves = size + 1 - (1 << ((size + 1).bit_length() - 1))
+        self._compress(pseudo_root, leaves)
+        size -= leaves
+        while size > 1:
+            size //= 2
+            self._compress(pseudo_root, size)
+
+        self.root = pseudo_root.right
+        self._recount_subtrees()
+        self.depth_counts = None
+
+    def _recount_subtrees(self):
+        """Refresh every node's subtree fields (see _recount_node) bottom-up, holding an O(height) stack."""
+        stack = []
+        node = self.root
+        last = None
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+                continue
+            top = stack[-1]
+            if top.right and last is not top.right:
+                node = top.right
+            else:
+                self._recount_node(top)
+                last = stack.pop()
+
+    def _recount_node(self, node):
+        node.size = node.count + self._size(node.left) + self._size(node.right)
+
+    def _rebuild_subtree(self, node, base_depth):
+        """Relink the existing nodes under node (at base_depth) into a perfectly balanced shape."""
+        counts = self.depth_counts
+        nodes = []
+        stack = []
+        depth = base_depth
+        while stack or node:
+            if node:
+                stack.append((node, depth))
+                node = node.left
+                depth += 1
+            else:
+                node, depth = stack.pop()
+                nodes.append(node)
+                if counts is not None:
+                    counts[depth] -= 1
+                node = node.right
+                depth += 1
+
+        for n in nodes:
+            n.left = n.right = None
+        # Same slice-splitting scheme as _build_balanced, but reusing the nodes
+        root = None
+        linked = []
+        stack = [(None, False, 0, len(nodes) - 1, base_depth)]
+        while stack:
+            parent, attach_left, start, end, depth = stack.pop()
             if start > end:
-                return None
+                continue
             mid = (start + end) // 2
-            node = BSTNode(keys[mid])
-            node.left = build_balanced_tree(keys, start, mid - 1)
-            node.right = build_balanced_tree(keys, mid + 1, end)
-            return node
+            linked.append(nodes[mid])
+            if counts is not None:
+                counts[depth] += 1
+            if parent is None:
+                root = nodes[mid]
+            elif attach_left:
+                parent.left = nodes[mid]
+            else:
+                parent.right = nodes[mid]
+            stack.append((nodes[mid], True, start, mid - 1, depth + 1))
+            stack.append((nodes[mid], False, mid + 1, end, depth + 1))
+
+        # Parents are linked before their children, so a reverse pass sees children first
+        for n in reversed(linked):
+            n.size = n.count + self._size(n.left) + self._size(n.right)
+
+        # The rebuild only ever makes the subtree shallower, so drop emptied bottom levels
+        while counts and counts[-1] == 0:
+            counts.pop()
+        return root
+
+    def _compress(self, scanner, count):
+        """Left-rotate every other node along the vine below scanner, count times (links only)."""
+        for _ in range(count):
+            node = scanner.right
+            pivot = node.right
+            node.right = pivot.left
+            pivot.left = node
+            scanner.right = pivot
+            scanner = pivot
+
+    def _rotate_left(self, node):
+        """Rotate node's right child up and return the new subtree root."""
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        pivot.size = node.size
+        node.size = node.count + self._size(node.left) + self._size(node.right)
+        return pivot
+
+    def _rotate_right(self, node):
+        """Rotate node's left child up and return the new subtree root."""
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        pivot.size = node.size
+        node.size = node.count + self._size(node.left) + self._size(node.right)
+        return pivot
+
+    @staticmethod
+    def _size(node):
+        return node.size if node else 0
+
+    def _rank(self, key, inclusive):
+        """Count keys < key (or <= key when inclusive) in one root-to-leaf walk."""
+        rank = 0
+        node = self.root
+        while node:
+            if key < node.key or (key == node.key and not inclusive):
+                node = node.left
+            else:
+                rank += node.count + self._size(node.left)
+                node = node.right
+        return rank
+
+    def rank(self, key):
+        """Return the number of keys strictly smaller than key."""
+        return self._rank(key, inclusive=False)
+
+    def select(self, i):
+        """Return the i-th smallest key (0-based)."""
+        if not 0 <= i < self._size(self.root):
+            raise IndexError("select index out of range")
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if i < left_size:
+                node = node.left
+            elif i < left_size + node.count:
+                return node.key
+            else:
+                i -= left_size + node.count
+                node = node.right
 
-        # Get all keys in sorted order
-        keys = []
-        self.inorder_traversal(self.root, keys)
+    def count_range(self, lo, hi):
+        """Return how many keys fall in [lo, hi] in O(log n)."""
+        if lo > hi:
+            return 0
+        return self._rank(hi, inclusive=True) - self._rank(lo, inclusive=False)
+
+    def __iter__(self):
+        """Lazily yield every key in sorted order, holding only O(height) nodes at a time."""
+        return self.iter_from(None)
+
+    def iter_from(self, key):
+        """Lazily yield the keys >= key in sorted order; None starts from the smallest key."""
+        stack = []
+        node = self.root
+        while stack or node:
+            if node:
+                if key is not None and node.key < key:
+                    # Everything on the left is smaller still
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                for _ in range(node.count):
+                    yield node.key
+                node = node.right
+
+# Persistent snapshots for readers on other threads
+class BSTSnapshot:
+    """Read-only view of a BST at the moment BST.snapshot() was called.
+
+    The tree switches to path-copying inserts while a snapshot is alive, so none of the nodes
+    reachable from here are ever modified and the view can be read from another thread without locks.
+    """
+    __slots__ = ("root", "__weakref__")
+
+    def __init__(self, root):
+        self.root = root
+
+    def __len__(self):
+        return self._size(self.root)
+
+    _size = staticmethod(BST._size)
+    _rank = BST._rank
+    search = BST.search
+    search_many = BST.search_many
+    rank = BST.rank
+    select = BST.select
+    count_range = BST.count_range
+    __iter__ = BST.__iter__
+    iter_from = BST.iter_from
+    range = BST.range
+
+# Per-node heights for the self-adjusting trees
+class HeightTracking:
+    """Keeps node.height, the number of levels in each node's subtree, current so height() is O(1).
+
+    Mixed in ahead of BST by trees whose nodes have a height slot; rotations and balanced builds
+    refresh the heights they change, and insert retraces its path with _update_path.
+    """
+
+    def height(self):
+        return self.root.height if self.root else 0
+
+    @staticmethod
+    def _node_height(node):
+        return node.height if node else 0
+
+    def _update_height(self, node):
+        node.height = 1 + max(self._node_height(node.left), self._node_height(node.right))
+
+    def _update_path(self, path):
+        """Refresh heights bottom-up along path (listed root first) until one comes out unchanged."""
+        for node in reversed(path):
+            left, right = node.left, node.right
+            lh = left.height if left else 0
+            rh = right.height if right else 0
+            height = (lh if lh > rh else rh) + 1
+            if height == node.height:
+                break
+            node.height = height
+
+    # The rotations run on every splay step, so sizes and heights are updated inline
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = inner = pivot.left
+        pivot.left = node
+        pivot.size = node.size
+        left = node.left
+        node.size = node.count + (left.size if left else 0) + (inner.size if inner else 0)
+        lh = left.height if left else 0
+        ih = inner.height if inner else 0
+        node.height = height = (lh if lh > ih else ih) + 1
+        oh = pivot.right.height if pivot.right else 0
+        pivot.height = (height if height > oh else oh) + 1
+        return pivot
+
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = inner = pivot.right
+        pivot.right = node
+        pivot.size = node.size
+        right = node.right
+        node.size = node.count + (inner.size if inner else 0) + (right.size if right else 0)
+        ih = inner.height if inner else 0
+        rh = right.height if right else 0
+        node.height = height = (ih if ih > rh else rh) + 1
+        oh = pivot.left.height if pivot.left else 0
+        pivot.height = (height if height > oh else oh) + 1
+        return pivot
+
+    def _finish_build(self, built):
+        super()._finish_build(built)
+        for node, _ in reversed(built):
+            self._update_height(node)
+
+    def _recount_node(self, node):
+        super()._recount_node(node)
+        self._update_height(node)
+
+# AVL Tree Implementation
+class AVLNode(BSTNode):
+    __slots__ = ("height",)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.height = 1
+
+class AVLTree(HeightTracking, BST):
+    """BST that rebalances on every insert so height stays within ~1.44 log2(n)."""
+    node_class = AVLNode
+
+    def insert(self, key):
+        # Rotations move whole subtrees between depths, so the histogram is recounted on demand
+        self.depth_counts = None
+        new_node = self.node_class(key)
+        if self.root is None:
+            self.root = new_node
+            return
+
+        # Descend to the insertion point, remembering the path for the retrace
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            node.size += 1
+            if self.multiset and key == node.key:
+                node.count += 1
+                return
+            node = node.left if key < node.key else node.right
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+        # Walk back up fixing heights; at most one (single or double) rotation is needed
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            subtree = self._rebalance(node)
+            if i == 0:
+                self.root = subtree
+            elif path[i - 1].left is node:
+                path[i - 1].left = subtree
+            else:
+                path[i - 1].right = subtree
+            if subtree is not node or subtree.height == old_height:
+                break
+
+    def balance(self):
+        """AVL trees are always balanced, so there is nothing to do."""
+
+    def _rebalance(self, node):
+        """Restore the AVL invariant at node and return the subtree root."""
+        self._update_height(node)
+        balance_factor = self._node_height(node.left) - self._node_height(node.right)
+        if balance_factor > 1:
+            if self._node_height(node.left.left) < self._node_height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance_factor < -1:
+            if self._node_height(node.right.right) < self._node_height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+# Red-Black Tree Implementation
+class RedBlackNode(BSTNode):
+    __slots__ = ("is_red", "height")
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.is_red = True
+        self.height = 1
+
+class RedBlackTree(HeightTracking, BST):
+    """BST kept balanced by node colours; each insert does at most two rotations."""
+    node_class = RedBlackNode
+
+    def insert(self, key):
+        # Rotations move whole subtrees between depths, so the histogram is recounted on demand
+        self.depth_counts = None
+        new_node = self.node_class(key)
+        if self.root is None:
+            new_node.is_red = False
+            self.root = new_node
+            return
+
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            node.size += 1
+            if self.multiset and key == node.key:
+                node.count += 1
+                return
+            node = node.left if key < node.key else node.right
+        if key < path[-1].key:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+
+        # Fix red-red violations; recolouring moves up, a rotation ends the loop
+        node = new_node
+        while path and path[-1].is_red:
+            parent = path.pop()
+            grandparent = path.pop()  # a red parent is never the root
+            uncle = grandparent.right if parent is grandparent.left else grandparent.left
+            if uncle and uncle.is_red:
+                parent.is_red = False
+                uncle.is_red = False
+                grandparent.is_red = True
+                # Heights stay current below node, which is all a later rotation reads
+                self._update_path([grandparent, parent])
+                node = grandparent
+                continue
+
+            if parent is grandparent.left:
+                if node is parent.right:
+                    grandparent.left = self._rotate_left(parent)
+                subtree = self._rotate_right(grandparent)
+            else:
+                if node is parent.left:
+                    grandparent.right = self._rotate_right(parent)
+                subtree = self._rotate_left(grandparent)
+            subtree.is_red = False
+            grandparent.is_red = True
+            self._replace_child(path[-1] if path else None, grandparent, subtree)
+            break
+
+        self._update_path(path)
+        self.root.is_red = False
+
+    def balance(self):
+        """Red-black trees are always balanced, so there is nothing to do."""
+
+    def _finish_build(self, built):
+        """Colour a freshly built balanced tree: only a partially filled bottom level is red."""
+        super()._finish_build(built)
+        if not built:
+            return
+        bottom = max(depth for _, depth in built)
+        bottom_full = sum(1 for _, depth in built if depth == bottom) == 1 << bottom
+        for node, depth in built:
+            node.is_red = depth == bottom and not bottom_full
+
+    def _replace_child(self, parent, old, new):
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+# Scapegoat Tree Implementation
+class ScapegoatTree(BST):
+    """BST that rebuilds only the offending subtree when an insert lands too deep."""
+
+    def __init__(self, alpha=2/3, multiset=False):
+        super().__init__(multiset)
+        self.alpha = alpha
+        self.rebuilds = 0
+
+    def insert(self, key):
+        new_node = self.node_class(key)
+        if self.root is None:
+            self.root = new_node
+            self._record_depth(0)
+            return
+
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            node.size += 1
+            if self.multiset and key == node.key:
+                node.count += 1
+                return
+            node = node.left if key < node.key else node.right
+        if key < path[-1].key:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+        self._record_depth(len(path))
+
+        # Depth of the new node is len(path); within the bound there is nothing to do
+        if len(path) <= math.log(self.root.size, 1 / self.alpha):
+            return
+
+        # Walk back up to the first ancestor that is not alpha-weight-balanced
+        child = new_node
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            if child.size > self.alpha * node.size:
+                subtree = self._rebuild_subtree(node, i)
+                if i == 0:
+                    self.root = subtree
+                elif path[i - 1].left is node:
+                    path[i - 1].left = subtree
+                else:
+                    path[i - 1].right = subtree
+                self.rebuilds += 1
+                return
+            child = node
+
+# Splay Tree Implementation
+class SplayNode(BSTNode):
+    __slots__ = ("height",)
+
+    def __init__(self, key):
+        super().__init__(key)
+        self.height = 1
+
+class SplayTree(HeightTracking, BST):
+    """Self-adjusting BST: every access rotates the touched node to the root, so hot keys stay shallow.
+
+    Splaying rotates every node on the access path, which refreshes each of their heights on the way.
+    """
+    node_class = SplayNode
+
+    def insert(self, key):
+        # Splaying reshapes the tree on every access, so the histogram is recounted on demand
+        self.depth_counts = None
+        new_node = self.node_class(key)
+        if self.root is None:
+            self.root = new_node
+            return
 
-        # Rebuild the tree
-        self.root = build_balanced_tree(keys, 0, len(keys) - 1)
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            node.size += 1
+            if self.multiset and key == node.key:
+                node.count += 1
+                self._splay(path)
+                return
+            node = node.left if key < node.key else node.right
+        if key < path[-1].key:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+        path.append(new_node)
+        self._splay(path)
+
+    def search(self, key):
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            if node.key == key:
+                break
+            node = node.left if key < node.key else node.right
+        # On a miss the last node visited is splayed instead, as in the textbook algorithm
+        if path:
+            self.depth_counts = None
+            self._splay(path)
+        return node is not None
+
+    def _splay(self, path):
+        """Rotate path[-1] up to the root; path lists the nodes from the root down to it."""
+        node = path.pop()
+        while path:
+            parent = path.pop()
+            if not path:
+                # Zig: parent is the root
+                if parent.left is node:
+                    self._rotate_right(parent)
+                else:
+                    self._rotate_left(parent)
+                break
+
+            grandparent = path.pop()
+            if grandparent.left is parent and parent.left is node:
+                # Zig-zig
+                self._rotate_right(grandparent)
+                self._rotate_right(parent)
+            elif grandparent.right is parent and parent.right is node:
+                self._rotate_left(grandparent)
+                self._rotate_left(parent)
+            elif grandparent.left is parent:
+                # Zig-zag
+                grandparent.left = self._rotate_left(parent)
+                self._rotate_right(grandparent)
+            else:
+                grandparent.right = self._rotate_right(parent)
+                self._rotate_left(grandparent)
+
+            if path:
+                if path[-1].left is grandparent:
+                    path[-1].left = node
+                else:
+                    path[-1].right = node
+        self.root = node
+
+# Array-backed BST Implementation
+# Range of the signed 64-bit slots (array typecode 'q') that flat key buffers are made of
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+class ArrayNode:
+    """Lightweight view of one slot in an ArrayBST, so drawing code can walk it like BSTNode."""
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def key(self):
+        return self.tree.keys[self.index]
+
+    @property
+    def left(self):
+        return self.tree._view(self.tree.lefts[self.index])
+
+    @property
+    def right(self):
+        return self.tree._view(self.tree.rights[self.index])
+
+    def __eq__(self, other):
+        return isinstance(other, ArrayNode) and self.tree is other.tree and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+class ArrayBST(OrderedQueries):
+    """BST stored as three parallel arrays (key, left index, right index) instead of node objects.
+
+    Child index -1 means "no child". Freed slots are chained through the left array
+    so delete/insert reuse them without growing the buffers. In multiset mode a fourth
+    array holds how many copies of each slot's key were inserted.
+    """
+
+    def __init__(self, multiset=False):
+        self.multiset = multiset
+        self.clear()
+
+    def clear(self):
+        self.keys = array('q')
+        self.lefts = array('i')
+        self.rights = array('i')
+        self.counts = array('i') if self.multiset else None
+        self.root_index = -1
+        self.free_head = -1
+        self.count = 0
+        self.depth_counts = []
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def root(self):
+        return self._view(self.root_index)
+
+    def _view(self, index):
+        return ArrayNode(self, index) if index != -1 else None
+
+    def _alloc(self, key):
+        """Return a slot for key, reusing the free list before growing the arrays."""
+        if self.free_head != -1:
+            index = self.free_head
+            self.free_head = self.lefts[index]
+            self.keys[index] = key
+            self.lefts[index] = -1
+            self.rights[index] = -1
+            if self.multiset:
+                self.counts[index] = 1
+            return index
+        self.keys.append(key)
+        self.lefts.append(-1)
+        self.rights.append(-1)
+        if self.multiset:
+            self.counts.append(1)
+        return len(self.keys) - 1
+
+    def _free(self, index):
+        self.lefts[index] = self.free_head
+        self.rights[index] = -1
+        self.free_head = index
+
+    @staticmethod
+    def _check_key(key):
+        """Raise ValueError, before anything is changed, for a key a 64-bit slot cannot hold."""
+        if not INT64_MIN <= key <= INT64_MAX:
+            raise ValueError(f"ArrayBST keys must fit in a signed 64-bit integer, got {key}")
+
+    def insert(self, key):
+        self._check_key(key)
+        self.count += 1
+        if self.root_index == -1:
+            self.root_index = self._alloc(key)
+            self._record_depth(0)
+            return
+        keys, lefts, rights = self.keys, self.lefts, self.rights
+        i = self.root_index
+        depth = 1
+        while True:
+            if self.multiset and key == keys[i]:
+                self.counts[i] += 1
+                return
+            if key < keys[i]:
+                if lefts[i] == -1:
+                    lefts[i] = self._alloc(key)
+                    break
+                i = lefts[i]
+            else:
+                if rights[i] == -1:
+                    rights[i] = self._alloc(key)
+                    break
+                i = rights[i]
+            depth += 1
+        self._record_depth(depth)
+
+    def _record_depth(self, depth):
+        if self.depth_counts is None:
+            return
+        if depth == len(self.depth_counts):
+            self.depth_counts.append(1)
+        else:
+            self.depth_counts[depth] += 1
+
+    def search(self, key):
+        keys, lefts, rights = self.keys, self.lefts, self.rights
+        i = self.root_index
+        while i != -1:
+            k = keys[i]
+            if k == key:
+                return True
+            i = lefts[i] if key < k else rights[i]
+        return False
+
+    def search_many(self, keys):
+        """Look up a batch of keys in one sorted pass; see BST.search_many."""
+        keys = list(keys)
+        found = [False] * len(keys)
+        tree_keys, lefts, rights = self.keys, self.lefts, self.rights
+        slots, uppers = [], []
+        for j in sorted(range(len(keys)), key=keys.__getitem__):
+            key = keys[j]
+            while uppers and uppers[-1] is not None and key >= uppers[-1]:
+                slots.pop()
+                uppers.pop()
+            if slots:
+                i, upper = slots.pop(), uppers.pop()
+            else:
+                i, upper = self.root_index, None
+            while i != -1:
+                slots.append(i)
+                uppers.append(upper)
+                k = tree_keys[i]
+                if k == key:
+                    found[j] = True
+                    break
+                if key < k:
+                    upper = k
+                    i = lefts[i]
+                else:
+                    i = rights[i]
+        return found
+
+    def delete(self, key):
+        """Remove one occurrence of key and return its slot to the free list."""
+        keys, lefts, rights = self.keys, self.lefts, self.rights
+        parent, i = -1, self.root_index
+        while i != -1 and keys[i] != key:
+            parent, i = i, (lefts[i] if key < keys[i] else rights[i])
+        if i == -1:
+            return False
+        self.count -= 1
+        if self.multiset and self.counts[i] > 1:
+            self.counts[i] -= 1
+            return True
+
+        # Two children: move the in-order successor's key up and delete that slot instead
+        if lefts[i] != -1 and rights[i] != -1:
+            succ_parent, succ = i, rights[i]
+            while lefts[succ] != -1:
+                succ_parent, succ = succ, lefts[succ]
+            keys[i] = keys[succ]
+            if self.multiset:
+                self.counts[i] = self.counts[succ]
+            parent, i = succ_parent, succ
+
+        child = lefts[i] if lefts[i] != -1 else rights[i]
+        if parent == -1:
+            self.root_index = child
+        elif lefts[parent] == i:
+            lefts[parent] = child
+        else:
+            rights[parent] = child
+        self._free(i)
+        # Splicing out a slot lifts its subtree one level; recount lazily
+        self.depth_counts = None
+        return True
+
+    def _inorder_indices(self):
+        order = array('i')
+        stack = []
+        i = self.root_index
+        while stack or i != -1:
+            if i != -1:
+                stack.append(i)
+                i = self.lefts[i]
+            else:
+                i = stack.pop()
+                order.append(i)
+                i = self.rights[i]
+        return order
+
+    def __iter__(self):
+        """Lazily yield every key in sorted order, holding only O(height) slot indices at a time."""
+        return self.iter_from(None)
+
+    def iter_from(self, key):
+        """Lazily yield the keys >= key in sorted order; None starts from the smallest key."""
+        keys, lefts, rights = self.keys, self.lefts, self.rights
+        stack = []
+        i = self.root_index
+        while stack or i != -1:
+            if i != -1:
+                if key is not None and keys[i] < key:
+                    i = rights[i]
+                else:
+                    stack.append(i)
+                    i = lefts[i]
+            else:
+                i = stack.pop()
+                for _ in range(self.counts[i] if self.multiset else 1):
+                    yield keys[i]
+                i = rights[i]
+
+    def inorder_traversal(self, node, result):
+        """Collect keys in order; node is accepted for BST compatibility and must be the root."""
+        for i in self._inorder_indices():
+            result.extend([self.keys[i]] * (self.counts[i] if self.multiset else 1))
+
+    def balance(self):
+        """Relink the existing slots into a balanced shape; only an index array is allocated."""
+        order = self._inorder_indices()
+        for i in order:
+            self.lefts[i] = self.rights[i] = -1
+        self._link_balanced(order)
+
+    def bulk_insert(self, iterable):
+        """Merge a batch into the tree, storing all keys in sorted slot order and linking them balanced."""
+        batch = sorted(iterable)
+        if not batch:
+            return
+        self._check_key(batch[0])
+        self._check_key(batch[-1])
+        merged = list(heapq.merge(self, batch))
+
+        self.clear()
+        if self.multiset:
+            for key, group in groupby(merged):
+                self.keys.append(key)
+                self.counts.append(sum(1 for _ in group))
+        else:
+            self.keys.extend(merged)
+        self.lefts = array('i', [-1]) * len(self.keys)
+        self.rights = array('i', [-1]) * len(self.keys)
+        self.count = len(merged)
+        self._link_balanced(range(len(self.keys)))
+
+    def _link_balanced(self, order):
+        """Link the slots listed in sorted order (all currently childless) into a balanced tree."""
+        self.root_index = -1
+        stack = [(-1, False, 0, len(order) - 1)]
+        while stack:
+            parent, attach_left, start, end = stack.pop()
+            if start > end:
+                continue
+            mid = (start + end) // 2
+            index = order[mid]
+            if parent == -1:
+                self.root_index = index
+            elif attach_left:
+                self.lefts[parent] = index
+            else:
+                self.rights[parent] = index
+            stack.append((index, True, start, mid - 1))
+            stack.append((index, False, mid + 1, end))
+        self.depth_counts = None
+
+    def height(self):
+        return len(self.depth_histogram())
+
+    def depth_histogram(self):
+        if self.depth_counts is None:
+            self.depth_counts = []
+            level = [self.root_index] if self.root_index != -1 else []
+            while level:
+                self.depth_counts.append(len(level))
+                level = [child for i in level for child in (self.lefts[i], self.rights[i]) if child != -1]
+        return self.depth_counts
+
+    def bytes_per_node(self):
+        if not self.count:
+            return 0
+        size = self.keys.itemsize + self.lefts.itemsize + self.rights.itemsize
+        return size + self.counts.itemsize if self.multiset else size
+
+    def dump_buffers(self):
+        """Snapshot the tree as raw bytes: a small header plus the slot arrays."""
+        header = array('q', [self.root_index, self.free_head, self.count, int(self.multiset)])
+        count_bytes = self.counts.tobytes() if self.multiset else b""
+        return (header.tobytes(), self.keys.tobytes(), self.lefts.tobytes(),
+                self.rights.tobytes(), count_bytes)
+
+    @classmethod
+    def load_buffers(cls, buffers):
+        """Rebuild a tree from the output of dump_buffers."""
+        header_bytes, key_bytes, left_bytes, right_bytes, count_bytes = buffers
+        header = array('q')
+        header.frombytes(header_bytes)
+        tree = cls(multiset=bool(header[3]))
+        tree.root_index, tree.free_head, tree.count = header[:3]
+        tree.keys.frombytes(key_bytes)
+        tree.lefts.frombytes(left_bytes)
+        tree.rights.frombytes(right_bytes)
+        if tree.multiset:
+            tree.counts.frombytes(count_bytes)
+        tree.depth_counts = None
+        return tree
+
+# Skip List Implementation
+class NodeView:
+    """Read-only BST-shaped node used to draw non-binary backends with the tree canvas code."""
+    __slots__ = ("key", "left", "right")
+
+    def __init__(self, key):
+        self.key = key
+        self.left = None
+        self.right = None
+
+class SkipList(OrderedQueries):
+    """Probabilistic ordered set: sorted linked lists stacked in levels, no rotations needed.
+
+    Each key is one tower, a plain list [key, next_0, next_1, ...] holding the tower's forward
+    link on every level it reaches, so a key costs one list object rather than a node per level.
+    """
+
+    def __init__(self, p=0.5, max_level=32, multiset=False):
+        # A new tower climbs one more level with probability p
+        self.p = p
+        self.max_level = max_level
+        # Duplicates always get their own tower; there is no counted mode
+        if multiset:
+            raise ValueError("SkipList stores duplicates as repeated keys; multiset mode is not supported")
+        self.multiset = False
+        self.clear()
+
+    def clear(self):
+        self.head = [None] * (self.max_level + 1)
+        self.level = 0  # levels currently in use
+        self.count = 0
+        self.total_height = 0
+        self.view = None  # cached tree-shaped view for drawing, rebuilt after changes
+        self.view_depths = None  # (view, depth histogram) for the view it was counted from
+
+    def __len__(self):
+        return self.count
+
+    def _random_height(self):
+        height = 1
+        while height < self.max_level and random.random() < self.p:
+            height += 1
+        return height
+
+    def insert(self, key):
+        # update[l] is the last tower before key on level l
+        update = [self.head] * self.max_level
+        node = self.head
+        for level in range(self.level - 1, -1, -1):
+            nxt = node[level + 1]
+            # <= places a duplicate after its equals, like the BST sends it right
+            while nxt is not None and nxt[0] <= key:
+                node = nxt
+                nxt = node[level + 1]
+            update[level] = node
+        height = self._random_height()
+        tower = [key] + [None] * height
+        for level in range(height):
+            tower[level + 1] = update[level][level + 1]
+            update[level][level + 1] = tower
+        self.level = max(self.level, height)
+        self.count += 1
+        self.total_height += height
+        self.view = None
+
+    def search(self, key):
+        node = self.head
+        for level in range(self.level, 0, -1):
+            nxt = node[level]
+            while nxt is not None and nxt[0] < key:
+                node = nxt
+                nxt = node[level]
+        nxt = node[1]
+        return nxt is not None and nxt[0] == key
+
+    def bulk_insert(self, iterable):
+        """Merge a batch into the list and relink every tower in one sorted pass."""
+        batch = sorted(iterable)
+        if not batch:
+            return
+        merged = list(heapq.merge(self, batch))
+        self.clear()
+        # Appending in order means the last tower on each level is the only predecessor needed
+        tails = [self.head] * self.max_level
+        for key in merged:
+            height = self._random_height()
+            tower = [key] + [None] * height
+            for level in range(height):
+                tails[level][level + 1] = tower
+                tails[level] = tower
+            self.level = max(self.level, height)
+            self.total_height += height
+        self.count = len(merged)
+
+    def balance(self):
+        """Nothing to do: random tower heights keep the expected search cost at O(log n)."""
+
+    def __iter__(self):
+        return self.iter_from(None)
+
+    def iter_from(self, key):
+        """Lazily yield the keys >= key in sorted order; None starts from the smallest key."""
+        node = self.head
+        if key is not None:
+            for level in range(self.level, 0, -1):
+                nxt = node[level]
+                while nxt is not None and nxt[0] < key:
+                    node = nxt
+                    nxt = node[level]
+        node = node[1]
+        while node is not None:
+            yield node[0]
+            node = node[1]
+
+    def average_tower_height(self):
+        return self.total_height / self.count if self.count else 0
+
+    def bytes_per_node(self):
+        """Average memory of one tower list, not counting the key it holds."""
+        if not self.count:
+            return 0
+        # A list of h + 1 slots costs its header plus one pointer per slot
+        header = sys.getsizeof([])
+        return round(header + 8 * (self.total_height / self.count + 1))
+
+    @property
+    def root(self):
+        """The skip list as an equivalent BST, for the tree canvas and search animation.
+
+        On each level the towers that reach it form a right spine; the shorter towers between
+        two of them hang off as the left subtree of the later one, recursively one level down.
+        """
+        if self.view is None:
+            holder = NodeView(None)
+            # Each entry is (start, end, level, parent, attach_left) for a run still to lay out
+            stack = [(self.head, None, self.level - 1, holder, False)]
+            while stack:
+                start, end, level, parent, attach_left = stack.pop()
+                while level >= 0 and start[level + 1] is end:
+                    level -= 1
+                if level < 0:
+                    continue
+                prev = start
+                tower = start[level + 1]
+                while tower is not end:
+                    view = NodeView(tower[0])
+                    if attach_left:
+                        parent.left = view
+                    else:
+                        parent.right = view
+                    stack.append((prev, tower, level - 1, view, True))
+                    prev, parent, attach_left = tower, view, False
+                    tower = tower[level + 1]
+                stack.append((prev, end, level - 1, parent, False))
+            self.view = holder
+        return self.view.right
+
+    def height(self):
+        """Return the number of levels in use, i.e. the tallest tower (0 for an empty list)."""
+        return self.level
+
+# B-Tree Implementation
+class BTreeNode:
+    __slots__ = ("keys", "children")
+
+    def __init__(self, keys=None, children=None):
+        self.keys = keys if keys is not None else []  # sorted, searched with bisect
+        self.children = children if children is not None else []  # empty for a leaf
+
+class BTree(OrderedQueries):
+    """Multiway search tree: each node holds up to order - 1 sorted keys searched with bisect.
+
+    The height is about log_order(n), so a lookup makes one C-level bisect per level instead of
+    one Python attribute hop per binary level.
+    """
+
+    def __init__(self, order=32, multiset=False):
+        if order < 3:
+            raise ValueError("order must be at least 3")
+        self.order = order
+        # Duplicates are stored as repeated keys; there is no counted mode
+        if multiset:
+            raise ValueError("BTree stores duplicates as repeated keys; multiset mode is not supported")
+        self.multiset = False
+        self.clear()
+
+    def clear(self):
+        self.btree_root = BTreeNode()
+        self.count = 0
+        self.nodes = 1
+        self.view = None  # cached binary view for drawing, rebuilt after changes
+        self.view_depths = None  # (view, depth histogram) for the view it was counted from
+
+    def __len__(self):
+        return self.count
+
+    def insert(self, key):
+        # Descend to the leaf, remembering each parent and the child slot taken
+        path = []
+        node = self.btree_root
+        while node.children:
+            i = bisect_right(node.keys, key)
+            path.append((node, i))
+            node = node.children[i]
+        insort_right(node.keys, key)
+        # Split overfull nodes on the way back up, pushing each median into the parent
+        while len(node.keys) >= self.order:
+            mid = len(node.keys) // 2
+            right = BTreeNode(node.keys[mid + 1:], node.children[mid + 1:])
+            median = node.keys[mid]
+            del node.keys[mid:]
+            del node.children[mid + 1:]
+            self.nodes += 1
+            if path:
+                node, i = path.pop()
+                node.keys.insert(i, median)
+                node.children.insert(i + 1, right)
+            else:
+                self.btree_root = BTreeNode([median], [node, right])
+                self.nodes += 1
+                break
+        self.count += 1
+        self.view = None
+
+    def search(self, key):
+        node = self.btree_root
+        while True:
+            keys = node.keys
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                return True
+            if not node.children:
+                return False
+            node = node.children[i]
+
+    def bulk_insert(self, iterable):
+        """Merge a batch into the tree and rebuild it bottom-up with full leaves."""
+        batch = sorted(iterable)
+        if not batch:
+            return
+        merged = list(heapq.merge(self, batch))
+        self.clear()
+        self.nodes = 0
+        self.btree_root = self._build(merged)
+        self.count = len(merged)
+
+    def _build(self, keys):
+        """Build a tree over sorted keys one level at a time, from the leaves up."""
+        children = []
+        while True:
+            # Spread the level's m + 1 gaps (children, or empty slots at the leaves) over the
+            # fewest nodes that can hold them; the key between two neighbours moves up a level
+            gaps = len(keys) + 1
+            groups = -(-gaps // self.order)
+            bounds = [round(g * gaps / groups) for g in range(groups + 1)]
+            nodes = [BTreeNode(keys[bounds[g]:bounds[g + 1] - 1], children[bounds[g]:bounds[g + 1]])
+                     for g in range(groups)]
+            self.nodes += groups
+            if groups == 1:
+                return nodes[0]
+            keys = [keys[bounds[g] - 1] for g in range(1, groups)]
+            children = nodes
+
+    def balance(self):
+        """Nothing to do: splits keep every leaf at the same depth."""
+
+    def levels(self):
+        """Return the number of node levels (leaves are all at the same depth)."""
+        levels = 1
+        node = self.btree_root
+        while node.children:
+            node = node.children[0]
+            levels += 1
+        return levels if self.count else 0
+
+    def __iter__(self):
+        return self.iter_from(None)
+
+    def iter_from(self, key):
+        """Lazily yield the keys >= key in sorted order; None starts from the smallest key."""
+        # Each entry is (node, next key index); start with the path down to the first candidate
+        stack = []
+        node = self.btree_root
+        while node is not None:
+            i = 0 if key is None else bisect_left(node.keys, key)
+            stack.append((node, i))
+            node = node.children[i] if node.children else None
+        while stack:
+            node, i = stack.pop()
+            if i >= len(node.keys):
+                continue
+            yield node.keys[i]
+            stack.append((node, i + 1))
+            # Everything between keys[i] and keys[i + 1] comes next, leftmost first
+            child = node.children[i + 1] if node.children else None
+            while child is not None:
+                stack.append((child, 0))
+                child = child.children[0] if child.children else None
+
+    def bytes_per_node(self):
+        """Average memory per key of the nodes and their key/child lists, not counting the keys.
+
+        Estimated from the node count: each node is its object plus two list headers, and
+        every key and every non-root node takes one list pointer (list over-allocation is
+        not counted).
+        """
+        if not self.count:
+            return 0
+        per_node = sys.getsizeof(BTreeNode()) + 2 * sys.getsizeof([])
+        return round((self.nodes * per_node + 8 * (self.count + self.nodes - 1)) / self.count)
+
+    @property
+    def root(self):
+        """The B-tree as an equivalent BST, for the tree canvas and search animation.
+
+        Each node's keys become a small balanced binary tree whose empty slots lead to the
+        matching children.
+        """
+        if self.view is None:
+            holder = NodeView(None)
+            # Each entry is (node, lo, hi, parent, attach_left) for node.keys[lo:hi + 1]
+            stack = [(self.btree_root, 0, len(self.btree_root.keys) - 1, holder, False)]
+            while stack:
+                node, lo, hi, parent, attach_left = stack.pop()
+                if lo > hi:
+                    # An empty key range is the gap that children[lo] fills
+                    if node.children:
+                        child = node.children[lo]
+                        stack.append((child, 0, len(child.keys) - 1, parent, attach_left))
+                    continue
+                mid = (lo + hi) // 2
+                view = NodeView(node.keys[mid])
+                if attach_left:
+                    parent.left = view
+                else:
+                    parent.right = view
+                stack.append((node, lo, mid - 1, view, True))
+                stack.append((node, mid + 1, hi, view, False))
+            self.view = holder
+        return self.view.right
+
+    def height(self):
+        """Return the number of node levels (0 for an empty tree)."""
+        return self.levels()
+
+# Frozen search layouts
+class EytzingerArray:
+    """Read-only copy of a tree's distinct keys stored in Eytzinger (BFS) order.
+
+    Slot 1 holds the root and slot k's children sit at 2k and 2k+1, so a lookup is an index
+    loop over one flat buffer instead of a chain of node attribute loads.
+    """
+
+    def __init__(self, keys):
+        """Build from any iterable of keys in sorted order, such as a tree."""
+        distinct = [key for key, _ in groupby(keys)]
+        self.count = len(distinct)
+        # Slot 0 is padding so the children of k are 2k and 2k+1
+        self.keys = array('q', bytes(8 * (self.count + 1)))
+        # An in-order walk of the implicit tree visits the slots in sorted order
+        stack = []
+        k = 1
+        for key in distinct:
+            while k <= self.count:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            self.keys[k] = key
+            k = 2 * k + 1
+
+    def __len__(self):
+        return self.count
+
+    def search(self, key):
+        keys = self.keys
+        n = self.count
+        k = 1
+        # No equality test on the way down: the comparison result picks the child directly
+        while k <= n:
+            k = 2 * k + (keys[k] < key)
+        # Drop the trailing right turns plus one left turn to land on the lower bound
+        k >>= (~k & (k + 1)).bit_length()
+        return k > 0 and keys[k] == key
+
+    def search_many(self, keys):
+        """Look up a batch of keys and return a list of booleans in the given order."""
+        if np is None or self.count == 0:
+            search = self.search
+            return [search(key) for key in keys]
+        # Walk every probe down the implicit tree together, one level per NumPy step
+        table = np.frombuffer(self.keys, dtype=np.int64)
+        probes = np.asarray(keys, dtype=np.int64)
+        k = np.ones(len(probes), dtype=np.int64)
+        n = self.count
+        for _ in range(n.bit_length()):
+            inside = k <= n
+            k = np.where(inside, 2 * k + (table[np.minimum(k, n)] < probes), k)
+        # Same lower-bound recovery as search: the lowest zero bit marks the last left turn
+        k //= 2 * (~k & (k + 1))
+        return ((k > 0) & (table[k] == probes)).tolist()
+
+    def bytes_per_key(self):
+        return self.keys.itemsize
+
+class VanEmdeBoasArray:
+    """Read-only copy of a tree's distinct keys in a cache-oblivious van Emde Boas layout.
+
+    The implicit complete tree is cut at half its height; the top half is stored first and each
+    bottom subtree follows it contiguously, recursively. Any subtree of height h then occupies
+    about 2^h consecutive slots, so a root-to-leaf walk touches O(log_B n) blocks for every block
+    size B at once. Slots past the last key of an incomplete tree are left as padding.
+    """
+
+    def __init__(self, keys):
+        """Build from any iterable of keys in sorted order, such as a tree."""
+        bfs = EytzingerArray(keys)
+        self.count = n = len(bfs)
+        self.height = n.bit_length()
+        # For each depth d that starts a bottom tree in the recursive split: the size of the
+        # top tree above it, the size of each bottom tree, and the depth of the top tree's root
+        self.top_sizes = [0] * self.height
+        self.bottom_sizes = [0] * self.height
+        self.top_depths = [0] * self.height
+        splits = [(0, self.height)]
+        while splits:
+            depth, h = splits.pop()
+            if h < 2:
+                continue
+            top = h // 2
+            cut = depth + top
+            self.top_sizes[cut] = (1 << top) - 1
+            self.bottom_sizes[cut] = (1 << (h - top)) - 1
+            self.top_depths[cut] = depth
+            splits.append((depth, top))
+            splits.append((cut, h - top))
+
+        # positions[i] is where BFS slot i lives; parents are placed before their children
+        self.keys = array('q', bytes(8 * ((1 << self.height) - 1)))
+        positions = array('q', bytes(8 * (n + 1)))
+        for i in range(1, n + 1):
+            d = i.bit_length() - 1
+            if d:
+                top = self.top_sizes[d]
+                anchor = positions[i >> (d - self.top_depths[d])]
+                positions[i] = anchor + top + (i & top) * self.bottom_sizes[d]
+            self.keys[positions[i]] = bfs.keys[i]
+
+    def __len__(self):
+        return self.count
+
+    def search(self, key):
+        keys = self.keys
+        n = self.count
+        tops, bottoms, anchors = self.top_sizes, self.bottom_sizes, self.top_depths
+        # path[d] is the layout position of the node visited at depth d
+        path = [0] * max(1, self.height)
+        i = 1
+        d = 0
+        while i <= n:
+            if d:
+                top = tops[d]
+                path[d] = path[anchors[d]] + top + (i & top) * bottoms[d]
+            i = 2 * i + (keys[path[d]] < key)
+            d += 1
+        # Same lower-bound recovery as EytzingerArray.search, then map the slot to its position
+        i >>= (~i & (i + 1)).bit_length()
+        return i > 0 and keys[path[i.bit_length() - 1]] == key
+
+    def search_many(self, keys):
+        """Look up a batch of keys and return a list of booleans in the given order."""
+        if np is None or self.count == 0:
+            search = self.search
+            return [search(key) for key in keys]
+        table = np.frombuffer(self.keys, dtype=np.int64)
+        probes = np.asarray(keys, dtype=np.int64)
+        i = np.ones(len(probes), dtype=np.int64)
+        path = np.zeros((self.height, len(probes)), dtype=np.int64)
+        # The lower bound is the last node where a probe turned left
+        candidate = np.full(len(probes), -1, dtype=np.int64)
+        for d in range(self.height):
+            inside = i <= self.count
+            if d:
+                top = self.top_sizes[d]
+                path[d] = np.where(inside, path[self.top_depths[d]] + top + (i & top) * self.bottom_sizes[d], 0)
+            right = table[path[d]] < probes
+            candidate = np.where(inside & ~right, path[d], candidate)
+            i = np.where(inside, 2 * i + right, i)
+        return ((candidate >= 0) & (table[candidate] == probes)).tolist()
+
+    def bytes_per_key(self):
+        return self.keys.itemsize * len(self.keys) / max(1, self.count)
+
+# Tree backends selectable from the Data tab
+TREE_BACKENDS = {
+    "BST": BST,
+    "AVL Tree": AVLTree,
+    "Red-Black Tree": RedBlackTree,
+    "Scapegoat Tree": ScapegoatTree,
+    "Splay Tree": SplayTree,
+    "Array BST": ArrayBST,
+    "Skip List": SkipList,
+    "B-Tree (order 8)": partial(BTree, order=8),
+    "B-Tree (order 64)": partial(BTree, order=64),
+}
+
+# B-tree orders timed by the comparison tab's order sweep
+BTREE_ORDERS = (4, 16, 64, 256)
+
+# Read-only layouts a tree can be frozen into with freeze(), also offered as lookup structures in the comparison
+FROZEN_LAYOUTS = {
+    "Eytzinger": EytzingerArray,
+    "van Emde Boas": VanEmdeBoasArray,
+}
+
+# Automatic rebalancing policies offered in the UI, as keyword arguments for BST.set_rebalance_policy
+REBALANCE_POLICIES = {
+    "Off": {},
+    "Height > 2·log2(n)": {"height_factor": 2},
+    "Every 1,000 inserts": {"every": 1000},
+}
+
+# Hash table fill levels offered in the UI; "1.0 (legacy)" grows only once the table is full
+HASH_MAX_LOADS = {
+    "0.5": 0.5,
+    "0.75": 0.75,
+    "1.0 (legacy)": 1.0,
+}
 
 # Hash Table Implementation
+# Marks a key deleted from the old table during an incremental resize; the slot must stay
+# occupied there, or keys further along its probe run would become unreachable
+_DELETED = object()
+
+# Probe sequences: each returns an iterator over the slots a key visits in a table of the given
+# size, home slot first. They are built from range/map/accumulate so no Python frame runs per probe
+def linear_probe(key, size):
+    home = key % size
+    return chain(range(home, size), range(home))
+
+def quadratic_probe(key, size):
+    # Triangular steps (home + i(i+1)/2) reach every slot exactly once when size is a power of two
+    return map(size.__rmod__, accumulate(range(1, size), initial=key % size))
+
+def double_hash_probe(key, size):
+    # An odd step from the key's higher bits is coprime with a power-of-two size
+    step = (key // size) % size | 1
+    home = key % size
+    return map(size.__rmod__, range(home, home + step * size, step))
+
+# Probe sequences offered in the UI; the non-linear ones need power-of-two tables
+PROBE_STRATEGIES = {
+    "Linear": linear_probe,
+    "Quadratic": quadratic_probe,
+    "Double Hashing": double_hash_probe,
+}
+
 class HashTable:
-    def __init__(self, size=100):
+    def __init__(self, size=100, max_load=0.75, incremental=False, migrate_step=8, robin_hood=False,
+                 probing=linear_probe):
+        if not 0 < max_load <= 1:
+            raise ValueError("max_load must be in (0, 1]")
+        if robin_hood and probing is not linear_probe:
+            raise ValueError("Robin Hood hashing needs linear probing")
+        if probing is not linear_probe:
+            size = 1 << (size - 1).bit_length()
         self.size = size
+        self.initial_size = size
         self.table = [None for _ in range(size)]
+        self.count = 0
+        # Grow before the table passes max_load; shrink once deletes leave it under a quarter of that
+        self.max_load = max_load
+        self.resizes = 0
+        # Incremental mode keeps the previous table during a resize and moves migrate_step of its
+        # slots into the new one on every operation, instead of rehashing everything at once
+        self.incremental = incremental
+        self.migrate_step = migrate_step
+        self.old_table = None
+        self.migrate_pos = 0
+        # Robin Hood mode keeps each key's probe distance in dists[slot]; a key that has
+        # travelled further takes the slot from one that has not
+        self.robin_hood = robin_hood
+        self.dists = [0] * size if robin_hood else None
+        # probing(key, size) yields the probe sequence; backward-shift deletion only works for
+        # linear runs, so the other strategies leave _DELETED tombstones until the next rehash
+        self.probing = probing
+        self.tombstones = 0
+        # Keys in the current table and the probes a successful search of each takes, summed,
+        # so average_probe_length doesn't have to scan the table
+        self.placed = 0
+        self.probe_total = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Yield every stored key, including ones still waiting in the old table."""
+        for val in self.table:
+            if val is not None and val is not _DELETED:
+                yield val
+        if self.old_table is not None:
+            for val in self.old_table[self.migrate_pos:]:
+                if val is not None and val is not _DELETED:
+                    yield val
 
     def _hash(self, key):
         return key % self.size
 
     def insert(self, key):
+        if self.old_table is not None:
+            self._migrate(self.migrate_step)
+            if self.old_table is not None and self._find_old(key) >= 0:
+                return
+        if self.robin_hood:
+            if self._rh_find(key) >= 0:
+                return
+            if self.count + 1 > self.max_load * self.size:
+                self._resize(self.size * 2)
+            self._rh_place(key)
+            self.count += 1
+            return
         for _ in range(2):  # Try twice: before and after resizing
-            h = self._hash(key)
-            for i in range(self.size):
-                idx = (h + i) % self.size
-                if self.table[idx] is None or self.table[idx] == key:
-                    self.table[idx] = key
+            # Every probe sequence starts at the home slot, so settle the common cases there
+            # before paying for the iterator
+            home = key % self.size
+            if self.table[home] == key:
+                return
+            if self.table[home] is None and self.count + self.tombstones + 1 <= self.max_load * self.size:
+                self.table[home] = key
+                self.count += 1
+                self.placed += 1
+                self.probe_total += 1
+                return
+            reuse = reuse_probes = -1
+            for probes, idx in enumerate(self.probing(key, self.size), 1):
+                if self.table[idx] == key:
                     return
-            self._resize()
+                if self.table[idx] is None:
+                    break
+                if self.table[idx] is _DELETED and reuse < 0:
+                    reuse, reuse_probes = idx, probes
+            else:
+                idx = -1
+            # The key is absent, so it can take the first tombstone on its path
+            if reuse >= 0:
+                self.table[reuse] = key
+                self.tombstones -= 1
+                self.count += 1
+                self.placed += 1
+                self.probe_total += reuse_probes
+                return
+            if idx >= 0 and self.count + self.tombstones + 1 <= self.max_load * self.size:
+                self.table[idx] = key
+                self.count += 1
+                self.placed += 1
+                self.probe_total += probes
+                return
+            # Grow now rather than let probe runs stretch towards a full table; when only
+            # tombstones put it past max_load, a same-size rehash clears them instead
+            self._resize(self.size * 2 if self.count + 1 > self.max_load * self.size else self.size)
         raise Exception("Hash table is full")
 
-    def _resize(self):
+    def set_max_load(self, max_load):
+        """Change the growth threshold, growing right away if the table is already past it."""
+        if not 0 < max_load <= 1:
+            raise ValueError("max_load must be in (0, 1]")
+        self.max_load = max_load
+        new_size = self.size
+        while self.count > max_load * new_size:
+            new_size *= 2
+        if new_size != self.size:
+            self._resize(new_size)
+
+    def _resize(self, new_size):
+        # Only one migration at a time: a resize that lands mid-migration completes it first
+        self.finish_resize()
         old_table = self.table
-        self.size *= 2
-        self.table = [None for _ in range(self.size)]
+        self.size = new_size
+        # One C-level allocation; a comprehension here would be most of an incremental resize's pause
+        self.table = [None] * self.size
+        self.dists = [0] * self.size if self.robin_hood else None
+        self.tombstones = 0
+        self.placed = self.probe_total = 0
+        self.resizes += 1
+        if self.incremental:
+            self.old_table = old_table
+            self.migrate_pos = 0
+            return
         for val in old_table:
-            if val is not None:
-                h = self._hash(val)
-                for i in range(self.size):
-                    idx = (h + i) % self.size
-                    if self.table[idx] is None:
-                        self.table[idx] = val
-                        break
+            if val is not None and val is not _DELETED:
+                self._place(val)
+
+    def _place(self, val):
+        """Put a key known not to be stored yet into the first free slot of its probe run."""
+        if self.robin_hood:
+            self._rh_place(val)
+            return
+        self.placed += 1
+        home = val % self.size
+        if self.table[home] is None:
+            self.table[home] = val
+            self.probe_total += 1
+            return
+        for probes, idx in enumerate(self.probing(val, self.size), 1):
+            if self.table[idx] is None:
+                self.table[idx] = val
+                self.probe_total += probes
+                return
+
+    def _migrate(self, steps):
+        """Move the next steps slots of the old table into the current one."""
+        old = self.old_table
+        end = min(len(old), self.migrate_pos + steps)
+        for idx in range(self.migrate_pos, end):
+            val = old[idx]
+            if val is not None and val is not _DELETED:
+                self._place(val)
+        self.migrate_pos = end
+        if end == len(old):
+            self.old_table = None
+
+    def finish_resize(self):
+        """Complete any incremental resize in progress, leaving a single table."""
+        if self.old_table is not None:
+            self._migrate(len(self.old_table))
+
+    def _find_old(self, key):
+        """Return the old table slot holding key, or -1; migrated slots are left in place."""
+        old = self.old_table
+        for idx in self.probing(key, len(old)):
+            if old[idx] is None:
+                return -1
+            if old[idx] == key:
+                return idx
+        return -1
+
+    def set_robin_hood(self, enabled):
+        """Switch probing modes, rehashing every key into a fresh table of the same size."""
+        if enabled and self.probing is not linear_probe:
+            raise ValueError("Robin Hood hashing needs linear probing")
+        self.finish_resize()
+        keys = list(self)
+        self.robin_hood = enabled
+        self.table = [None] * self.size
+        self.dists = [0] * self.size if enabled else None
+        self.tombstones = 0
+        self.placed = self.probe_total = 0
+        for key in keys:
+            self._place(key)
+
+    def set_probing(self, probing):
+        """Switch probe sequences, rehashing every key (into a power-of-two table if non-linear)."""
+        if self.robin_hood and probing is not linear_probe:
+            raise ValueError("Robin Hood hashing needs linear probing")
+        self.finish_resize()
+        keys = list(self)
+        self.probing = probing
+        if probing is not linear_probe:
+            self.size = 1 << (self.size - 1).bit_length()
+            self.initial_size = 1 << (self.initial_size - 1).bit_length()
+        self.table = [None] * self.size
+        self.tombstones = 0
+        self.placed = self.probe_total = 0
+        for key in keys:
+            self._place(key)
+
+    def _rh_place(self, key):
+        """Robin Hood insert of a key known to be absent: displace any resident closer to home."""
+        table, dists, size = self.table, self.dists, self.size
+        idx = start = self._hash(key)
+        dist = 0
+        while table[idx] is not None:
+            if dists[idx] < dist:
+                table[idx], key = key, table[idx]
+                dists[idx], dist = dist, dists[idx]
+            idx = (idx + 1) % size
+            dist += 1
+        table[idx] = key
+        dists[idx] = dist
+        # Swaps only trade distances between keys, so the total grows by one per step taken
+        self.placed += 1
+        self.probe_total += (idx - start) % size + 1
+
+    def _rh_find(self, key):
+        """Return key's slot or -1, giving up as soon as a resident is closer to home than we are."""
+        table, dists, size = self.table, self.dists, self.size
+        idx = self._hash(key)
+        dist = 0
+        # Robin Hood ordering means key would have displaced that resident, so it isn't stored
+        while table[idx] is not None and dists[idx] >= dist:
+            if table[idx] == key:
+                return idx
+            idx = (idx + 1) % size
+            dist += 1
+        return -1
 
     def search(self, key):
-        h = self._hash(key)
-        for i in range(self.size):
-            idx = (h + i) % self.size
+        if self.old_table is not None:
+            self._migrate(self.migrate_step)
+        if self.robin_hood:
+            return self._rh_find(key) >= 0 or (self.old_table is not None and self._find_old(key) >= 0)
+        home = key % self.size
+        if self.table[home] == key:
+            return True
+        if self.table[home] is not None:
+            for idx in self.probing(key, self.size):
+                if self.table[idx] is None:
+                    break
+                if self.table[idx] == key:
+                    return True
+        return self.old_table is not None and self._find_old(key) >= 0
+
+    def delete(self, key):
+        """Remove key if present and return whether it was; no tombstones are left behind."""
+        in_old = False
+        if self.old_table is not None:
+            self._migrate(self.migrate_step)
+            if self.old_table is not None:
+                idx = self._find_old(key)
+                if idx >= 0:
+                    self.old_table[idx] = _DELETED
+                    in_old = True
+        if not (self._remove(key) or in_old):
+            return False
+        self.count -= 1
+        if self.size // 2 >= self.initial_size and self.count < self.max_load / 4 * self.size:
+            self._resize(self.size // 2)
+        return True
+
+    def _remove(self, key):
+        """Delete key from the current table by backward shift; return whether it was there."""
+        if self.robin_hood:
+            idx = self._rh_find(key)
+            if idx < 0:
+                return False
+            self.placed -= 1
+            self.probe_total -= self.dists[idx] + 1
+            # Every follower that is away from home moves one slot back, closing the gap
+            nxt = (idx + 1) % self.size
+            while self.table[nxt] is not None and self.dists[nxt] > 0:
+                self.table[idx] = self.table[nxt]
+                self.dists[idx] = self.dists[nxt] - 1
+                self.probe_total -= 1
+                idx = nxt
+                nxt = (nxt + 1) % self.size
+            self.table[idx] = None
+            self.dists[idx] = 0
+            return True
+        for probes, idx in enumerate(self.probing(key, self.size), 1):
             if self.table[idx] is None:
                 return False
             if self.table[idx] == key:
-                return True
-        return False
+                break
+        else:
+            return False
+        self.placed -= 1
+        self.probe_total -= probes
+        if self.probing is not linear_probe:
+            self.table[idx] = _DELETED
+            self.tombstones += 1
+            return True
+        # Backward shift: pull later run members into the hole unless that would move one
+        # before its home slot, so searches never stop early at the gap
+        hole = start = idx
+        idx = (idx + 1) % self.size
+        # A table filled to a max_load of 1.0 has no empty slot to stop at, so stop after one lap
+        while idx != start and self.table[idx] is not None:
+            home = self._hash(self.table[idx])
+            if (idx - home) % self.size >= (idx - hole) % self.size:
+                self.table[hole] = self.table[idx]
+                self.probe_total -= (idx - hole) % self.size
+                hole = idx
+            idx = (idx + 1) % self.size
+        self.table[hole] = None
+        return True
+
+    def average_probe_length(self):
+        """Mean number of slots a successful search inspects in the current table."""
+        return self.probe_total / self.placed if self.placed else 0
 
     def clear(self):
+        self.size = self.initial_size
         self.table = [None for _ in range(self.size)]
+        self.dists = [0] * self.size if self.robin_hood else None
+        self.count = 0
+        self.tombstones = 0
+        self.placed = self.probe_total = 0
+        self.old_table = None
+        self.migrate_pos = 0
+
+    def copy(self):
+        """Return an independent copy whose slots later inserts won't touch."""
+        clone = HashTable(self.size, self.max_load, self.incremental, self.migrate_step, self.robin_hood,
+                          self.probing)
+        clone.initial_size = self.initial_size
+        clone.table = list(self.table)
+        clone.tombstones = self.tombstones
+        clone.placed, clone.probe_total = self.placed, self.probe_total
+        if self.robin_hood:
+            clone.dists = list(self.dists)
+        clone.count = self.count
+        if self.old_table is not None:
+            clone.old_table = list(self.old_table)
+            clone.migrate_pos = self.migrate_pos
+        return clone
+
+# Separate chaining, as in v3, kept as a baseline for the open-addressing tables
+class ChainedHashTable:
+    """Each bucket is a list of the keys that hash to it; grows once the average chain passes max_load."""
+
+    def __init__(self, size=100, max_load=1.0):
+        self.size = size
+        self.initial_size = size
+        self.table = [[] for _ in range(size)]
+        self.count = 0
+        self.max_load = max_load
+        self.resizes = 0
+        # Sum over keys of their position in their chain, kept so average_probe_length is O(1)
+        self.probe_total = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for bucket in self.table:
+            yield from bucket
+
+    def _hash(self, key):
+        return key % self.size
+
+    def insert(self, key):
+        bucket = self.table[self._hash(key)]
+        if key in bucket:
+            return
+        bucket.append(key)
+        self.count += 1
+        self.probe_total += len(bucket)
+        if self.count > self.max_load * self.size:
+            self._resize(self.size * 2)
+
+    def _resize(self, new_size):
+        keys = list(self)
+        self.size = new_size
+        self.table = [[] for _ in range(new_size)]
+        self.resizes += 1
+        self.probe_total = 0
+        for key in keys:
+            bucket = self.table[self._hash(key)]
+            bucket.append(key)
+            self.probe_total += len(bucket)
+
+    def search(self, key):
+        return key in self.table[self._hash(key)]
+
+    def delete(self, key):
+        bucket = self.table[self._hash(key)]
+        if key not in bucket:
+            return False
+        # Losing any key of the chain shortens every position after it by one, and in
+        # total that takes len(bucket) off the sum
+        self.probe_total -= len(bucket)
+        bucket.remove(key)
+        self.count -= 1
+        return True
+
+    def average_probe_length(self):
+        """Mean number of keys a successful search compares, i.e. its position in the chain."""
+        return self.probe_total / self.count if self.count else 0
+
+    def finish_resize(self):
+        """Resizes always complete in one step here."""
+
+    def clear(self):
+        self.size = self.initial_size
+        self.table = [[] for _ in range(self.size)]
+        self.count = 0
+        self.probe_total = 0
+
+    def copy(self):
+        """Return an independent copy whose buckets later inserts won't touch."""
+        clone = ChainedHashTable(self.size, self.max_load)
+        clone.initial_size = self.initial_size
+        clone.table = [list(bucket) for bucket in self.table]
+        clone.count = self.count
+        clone.probe_total = self.probe_total
+        return clone
+
+# Cuckoo Hashing Implementation
+class CuckooHashTable:
+    """Every key lives in one of `ways` candidate slots (one per table) or in a small stash.
+
+    A lookup therefore inspects at most ways + stash_size slots, whatever the load. An insert
+    that finds all its slots taken evicts a resident and re-homes it in its other table; a
+    chain that runs too long parks the last key in the stash, and a full stash triggers a
+    rehash with fresh hash functions (growing the tables if they are past max_load).
+    """
+    # Mersenne prime for the multiply-add-mod hash family
+    PRIME = (1 << 61) - 1
+
+    def __init__(self, size=100, ways=2, stash_size=4, max_load=0.45, max_kicks=64):
+        self.ways = ways
+        self.stash_size = stash_size
+        self.max_load = max_load
+        self.max_kicks = max_kicks
+        self.initial_size = size
+        self.resizes = 0
+        self.rehashes = 0
+        self._allocate(max(1, size // ways))
+        self.count = 0
+
+    def _allocate(self, slots_per_table):
+        self.slots = slots_per_table
+        self.size = slots_per_table * self.ways
+        self.tables = [[None] * slots_per_table for _ in range(self.ways)]
+        # Keys held by each table; kicks only move keys between filled slots, so these change
+        # just when a chain ends in an empty slot or a key is deleted
+        self.filled = [0] * self.ways
+        self.stash = []
+        self.hash_params = [(random.randrange(1, self.PRIME), random.randrange(self.PRIME))
+                            for _ in range(self.ways)]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for table in self.tables:
+            for key in table:
+                if key is not None:
+                    yield key
+        yield from self.stash
+
+    def _slot(self, way, key):
+        a, b = self.hash_params[way]
+        return (a * key + b) % self.PRIME % self.slots
+
+    def search(self, key):
+        for way in range(self.ways):
+            if self.tables[way][self._slot(way, key)] == key:
+                return True
+        return key in self.stash
+
+    def insert(self, key):
+        if self.search(key):
+            return
+        if self.count + 1 > self.max_load * self.size:
+            self._rebuild(self.slots * 2)
+        self.count += 1
+        self._place(key)
+
+    def _cuckoo(self, key):
+        """Cuckoo a key into the tables; return whichever key is left homeless, or None."""
+        way = 0
+        for _ in range(self.max_kicks):
+            for w in range(self.ways):
+                idx = self._slot(w, key)
+                if self.tables[w][idx] is None:
+                    self.tables[w][idx] = key
+                    self.filled[w] += 1
+                    return None
+            # Every candidate is taken: evict from the tables in rotation and re-home the victim
+            idx = self._slot(way, key)
+            key, self.tables[way][idx] = self.tables[way][idx], key
+            way = (way + 1) % self.ways
+        return key
+
+    def _place(self, key):
+        """Place a key known to be absent, falling back to the stash or a rehash."""
+        key = self._cuckoo(key)
+        if key is None:
+            return
+        if len(self.stash) < self.stash_size:
+            self.stash.append(key)
+            return
+        # The eviction chain is stuck: pick new hash functions and place everything again
+        self.rehashes += 1
+        self._rebuild(self.slots, extra=key)
+
+    def _rebuild(self, slots_per_table, extra=None):
+        keys = list(self)
+        if extra is not None:
+            keys.append(extra)
+        old_slots = self.slots
+        attempts = 0
+        while not self._fill(keys, slots_per_table):
+            attempts += 1
+            # Fresh hash functions keep failing at this size: give the keys more room
+            if attempts % 2 == 0:
+                slots_per_table *= 2
+        if self.slots != old_slots:
+            self.resizes += 1
+
+    def _fill(self, keys, slots_per_table):
+        """Place keys into freshly hashed tables; False if the stash overflows."""
+        self._allocate(slots_per_table)
+        for key in keys:
+            key = self._cuckoo(key)
+            if key is not None:
+                if len(self.stash) == self.stash_size:
+                    return False
+                self.stash.append(key)
+        return True
+
+    def delete(self, key):
+        for way in range(self.ways):
+            idx = self._slot(way, key)
+            if self.tables[way][idx] == key:
+                self.tables[way][idx] = None
+                self.filled[way] -= 1
+                break
+        else:
+            if key not in self.stash:
+                return False
+            self.stash.remove(key)
+        self.count -= 1
+        return True
+
+    def average_probe_length(self):
+        """Mean number of slots a successful search inspects (tables are checked in order)."""
+        if not self.count:
+            return 0
+        total = sum((way + 1) * filled for way, filled in enumerate(self.filled))
+        total += sum(self.ways + i + 1 for i in range(len(self.stash)))
+        return total / self.count
+
+    def finish_resize(self):
+        """Resizes always complete in one step here."""
+
+    def clear(self):
+        self._allocate(max(1, self.initial_size // self.ways))
+        self.count = 0
+
+    def copy(self):
+        """Return an independent copy whose slots later inserts won't touch."""
+        clone = CuckooHashTable(self.initial_size, self.ways, self.stash_size, self.max_load, self.max_kicks)
+        clone.slots, clone.size = self.slots, self.size
+        clone.tables = [list(table) for table in self.tables]
+        clone.filled = list(self.filled)
+        clone.stash = list(self.stash)
+        clone.hash_params = list(self.hash_params)
+        clone.count = self.count
+        return clone
+
+# Hash table backends selectable from the Data tab
+HASH_BACKENDS = {
+    "Open Addressing": HashTable,
+    "Chaining": ChainedHashTable,
+    "Cuckoo": CuckooHashTable,
+}
 
 # Create a tooltip class
 class ToolTip:
@@ -152,10 +2488,21 @@ class App:
         self.root.geometry("1200x750")
         self.root.configure(bg="#f5f5f5")
         self.large_tree_threshold = 2000
+        self.batch_repeats = 5  # Batches timed per sample size in batched lookup mode
+        self.compare_worker = None  # Thread timing lookups against a tree snapshot, while one runs
 
         # Initialize data structures
-        self.bst = BST()
-        self.ht = HashTable()
+        self.tree_backend = tk.StringVar(value="BST")
+        self.multiset_var = tk.BooleanVar(value=False)
+        self.rebalance_policy = tk.StringVar(value="Off")
+        self.max_load_var = tk.StringVar(value="0.75")
+        self.incremental_resize_var = tk.BooleanVar(value=False)
+        self.robin_hood_var = tk.BooleanVar(value=False)
+        self.probing_var = tk.StringVar(value="Linear")
+        self.hash_backend = tk.StringVar(value="Open Addressing")
+        self.bst = TREE_BACKENDS[self.tree_backend.get()](multiset=self.multiset_var.get())
+        self.active_tree_backend = self.tree_backend.get()  # Kept if a switch has to be undone
+        self.ht = self.make_hash_table(self.hash_backend.get())
         self.values = []
         
         # ← Add this line to initialize zoom level
@@ -376,6 +2723,62 @@ class App:
 
     def setup_data_tab(self, parent):
         """Setup the Data Management tab"""
+        # Tree Backend Section
+        backend_frame = ttk.LabelFrame(parent, text="Tree Backend", padding=10, style='Card.TLabelframe')
+        backend_frame.pack(fill=tk.X, pady=5)
+
+        backend_combo = ttk.Combobox(backend_frame, textvariable=self.tree_backend,
+                                   values=list(TREE_BACKENDS), state="readonly")
+        backend_combo.pack(fill=tk.X, pady=2)
+        backend_combo.bind("<<ComboboxSelected>>", self.set_tree_backend)
+        ToolTip(backend_combo, "Choose the tree implementation compared against the Hash Table")
+
+        self.multiset_check = ttk.Checkbutton(backend_frame, text="Count duplicate keys",
+                                            variable=self.multiset_var, command=self.set_tree_backend)
+        self.multiset_check.pack(anchor='w', pady=2)
+        ToolTip(self.multiset_check, "Store repeated values as a count on one node instead of extra nodes "
+                                     "(binary tree backends only)")
+
+        ttk.Label(backend_frame, text="Auto-Rebalance:", style='Card.TLabel').pack(anchor='w', pady=(5, 0))
+        policy_combo = ttk.Combobox(backend_frame, textvariable=self.rebalance_policy,
+                                  values=list(REBALANCE_POLICIES), state="readonly")
+        policy_combo.pack(fill=tk.X, pady=2)
+        policy_combo.bind("<<ComboboxSelected>>", self.set_rebalance_policy)
+        ToolTip(policy_combo, "Balance the plain BST automatically when it grows too deep or every N inserts")
+
+        ttk.Label(backend_frame, text="Hash Table Backend:", style='Card.TLabel').pack(anchor='w', pady=(5, 0))
+        hash_combo = ttk.Combobox(backend_frame, textvariable=self.hash_backend,
+                                values=list(HASH_BACKENDS), state="readonly")
+        hash_combo.pack(fill=tk.X, pady=2)
+        hash_combo.bind("<<ComboboxSelected>>", self.set_hash_backend)
+        ToolTip(hash_combo, "Collision strategy: open addressing, separate chaining, or cuckoo hashing")
+
+        ttk.Label(backend_frame, text="Probe Sequence:", style='Card.TLabel').pack(anchor='w', pady=(5, 0))
+        probing_combo = ttk.Combobox(backend_frame, textvariable=self.probing_var,
+                                   values=list(PROBE_STRATEGIES), state="readonly")
+        probing_combo.pack(fill=tk.X, pady=2)
+        probing_combo.bind("<<ComboboxSelected>>", self.set_probing)
+        ToolTip(probing_combo, "Order in which open addressing tries slots after a collision")
+
+        ttk.Label(backend_frame, text="Hash Table Max Load:", style='Card.TLabel').pack(anchor='w', pady=(5, 0))
+        load_combo = ttk.Combobox(backend_frame, textvariable=self.max_load_var,
+                                values=list(HASH_MAX_LOADS), state="readonly")
+        load_combo.pack(fill=tk.X, pady=2)
+        load_combo.bind("<<ComboboxSelected>>", self.set_hash_max_load)
+        ToolTip(load_combo, "Double the hash table once it would pass this fill level, keeping probe runs short")
+
+        incremental_check = ttk.Checkbutton(backend_frame, text="Incremental hash resize",
+                                          variable=self.incremental_resize_var,
+                                          command=self.toggle_incremental_resize)
+        incremental_check.pack(anchor='w', pady=2)
+        ToolTip(incremental_check, "Move a few old buckets per operation after a resize instead of rehashing all at once")
+
+        robin_hood_check = ttk.Checkbutton(backend_frame, text="Robin Hood hashing",
+                                         variable=self.robin_hood_var,
+                                         command=self.toggle_robin_hood)
+        robin_hood_check.pack(anchor='w', pady=2)
+        ToolTip(robin_hood_check, "Let keys far from home take slots from keys near home, so failed lookups stop early")
+
         # Manual Insert Section
         manual_frame = ttk.LabelFrame(parent, text="Manual Insert", padding=10)
         manual_frame = ttk.LabelFrame(parent, text="Manual Insert", padding=10, style='Card.TLabelframe')
@@ -429,6 +2832,11 @@ class App:
         balance_btn.pack(fill=tk.X, pady=2)
         ToolTip(balance_btn, "Balance the Binary Search Tree")
 
+        export_btn = ttk.Button(manage_frame, text="Export Sorted Keys",
+                         style="Action.TButton", command=self.export_sorted_keys)
+        export_btn.pack(fill=tk.X, pady=2)
+        ToolTip(export_btn, "Write the tree's keys to a text file in sorted order, one per line")
+
     def setup_test_tab(self, parent):
         """Setup the Testing tab"""
         # Search Section
@@ -447,6 +2855,25 @@ class App:
                                     command=self.search_value)
         simple_search_btn.pack(fill=tk.X, pady=2)
         ToolTip(simple_search_btn, "Search for the value in both data structures")
+
+        # Range Query Section
+        range_frame = ttk.LabelFrame(parent, text="Range Query", padding=10, style='Card.TLabelframe')
+        range_frame.pack(fill=tk.X, pady=10)
+
+        bounds_frame = ttk.Frame(range_frame, style='Card.TFrame')
+        bounds_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(bounds_frame, text="From:").pack(side=tk.LEFT, padx=(0, 5))
+        self.range_lo_entry = ttk.Entry(bounds_frame, width=8, style='Clean.TEntry')
+        self.range_lo_entry.pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Label(bounds_frame, text="To:").pack(side=tk.LEFT, padx=(0, 5))
+        self.range_hi_entry = ttk.Entry(bounds_frame, width=8, style='Clean.TEntry')
+        self.range_hi_entry.pack(side=tk.LEFT)
+
+        range_btn = ttk.Button(range_frame, text="Compare Range Query", style="Primary.TButton",
+                             command=self.compare_range_query)
+        range_btn.pack(fill=tk.X, pady=2)
+        ToolTip(range_btn, "Count and list values in the range: tree walk vs full Hash Table scan")
         
         # Animated Simulation Section
         sim_frame = ttk.LabelFrame(parent, text="Visualization", padding=10)
@@ -494,6 +2921,7 @@ class App:
 
         test_types = [("Random", "Random lookups from your data"),
                     ("Best-case", "Always search for the first value"),
+                    ("Skewed", "Zipf-distributed lookups where a few hot values dominate"),
                     ("Worst-case", "Search for values that don't exist")]
         
         for test, description in test_types:
@@ -505,6 +2933,30 @@ class App:
             radio = ttk.Radiobutton(test_frame, text=test, value=test, variable=self.test_type, style='Card.TRadiobutton')
             radio.pack(side=tk.LEFT)
             ToolTip(radio, description)
+
+        # Lookup mode selection
+        ttk.Label(config_frame, text="Lookup Mode:").pack(anchor='w', pady=(10, 5))
+
+        self.lookup_mode = tk.StringVar(value="Single")
+        lookup_modes = [("Single", "Time each search call on its own"),
+                        ("Batched", "Answer the whole sample with one search_many pass (time per key)")]
+
+        for mode, description in lookup_modes:
+            mode_frame = ttk.Frame(config_frame, style='Card.TFrame')
+            mode_frame.pack(fill=tk.X, pady=2)
+
+            radio = ttk.Radiobutton(mode_frame, text=mode, value=mode, variable=self.lookup_mode, style='Card.TRadiobutton')
+            radio.pack(side=tk.LEFT)
+            ToolTip(radio, description)
+
+        # Lookup structure selection: the live tree or a frozen flat copy of its keys
+        ttk.Label(config_frame, text="Lookup Structure:").pack(anchor='w', pady=(10, 5))
+
+        self.lookup_layout = tk.StringVar(value="Pointer tree")
+        layout_combo = ttk.Combobox(config_frame, textvariable=self.lookup_layout,
+                                  values=["Pointer tree"] + list(FROZEN_LAYOUTS), state="readonly")
+        layout_combo.pack(fill=tk.X, pady=2)
+        ToolTip(layout_combo, "Time the tree's own nodes, or a read-only copy frozen into a flat array layout")
         
         # Run comparison button
         run_frame = ttk.Frame(perf_frame)
@@ -515,6 +2967,11 @@ class App:
         compare_btn.pack(fill=tk.X)
         ToolTip(compare_btn, "Compare BST and Hash Table lookup performance across sample sizes")
 
+        orders_btn = ttk.Button(run_frame, text="Compare B-Tree Orders",
+                             style="Primary.TButton", command=self.compare_btree_orders)
+        orders_btn.pack(fill=tk.X, pady=(5, 0))
+        ToolTip(orders_btn, "Insert and lookup throughput of B-trees of several orders vs BST and Hash Table")
+
     def update_sample_size(self, value):
         """Update the sample size based on slider position"""
         # Convert slider value to sample size
@@ -773,16 +3230,23 @@ class App:
         """Insert a single value from the entry field"""
         try:
             val = int(self.insert_entry.get())
-            self.values.append(val)
-            self.bst.insert(val)
-            self.ht.insert(val)
-            self.insert_entry.delete(0, tk.END)
-            self.update_stats()
-            self.draw_visuals()
-            self.update_status(f"Inserted value: {val}")
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter an integer.")
             self.update_status("Error: Invalid input")
+            return
+        # The tree goes first: a backend that rejects the key must not leave the others ahead of it
+        try:
+            self.bst.insert(val)
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", str(e))
+            self.update_status("Error: Key out of range for the tree backend")
+            return
+        self.values.append(val)
+        self.ht.insert(val)
+        self.insert_entry.delete(0, tk.END)
+        self.update_stats()
+        self.draw_visuals()
+        self.update_status(f"Inserted value: {val}")
 
     def insert_random(self):
         """Insert 50 random values"""
@@ -873,11 +3337,77 @@ class App:
             messagebox.showerror("Invalid Input", "Please enter an integer.")
             self.update_status("Error: Invalid input")
 
+    def compare_range_query(self):
+        """Benchmark a range query on the tree against scanning every Hash Table slot"""
+        try:
+            lo = int(self.range_lo_entry.get())
+            hi = int(self.range_hi_entry.get())
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter integer range bounds.")
+            self.update_status("Error: Invalid input")
+            return
+        if lo > hi:
+            lo, hi = hi, lo
+
+        self.update_status(f"Running range query [{lo}, {hi}]...")
+        repeats = 20
+        tree_name = self.tree_backend.get()
+
+        # Tree: O(log n) count plus an O(log n + k) in-order walk of the matches
+        t1 = time.perf_counter()
+        for _ in range(repeats):
+            bst_count = self.bst.count_range(lo, hi)
+            bst_keys = list(self.bst.range(lo, hi))
+        bst_time = (time.perf_counter() - t1) / repeats
+
+        # Hash table: keys are scattered, so every slot has to be checked and the result sorted
+        t2 = time.perf_counter()
+        for _ in range(repeats):
+            ht_keys = sorted(v for v in self.ht if lo <= v <= hi)
+        ht_time = (time.perf_counter() - t2) / repeats
+
+        result_dialog = tk.Toplevel(self.root)
+        result_dialog.title("Range Query Results")
+        result_dialog.geometry("420x300")
+        result_dialog.transient(self.root)
+        result_dialog.grab_set()
+
+        result_frame = ttk.Frame(result_dialog, padding=20)
+        result_frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(result_frame, text=f"Range Query [{lo}, {hi}]",
+                style="Subtitle.TLabel").pack(pady=(0, 15))
+
+        for title, count, distinct, elapsed in (
+                (tree_name, bst_count, len(set(bst_keys)), bst_time),
+                ("Hash Table (full scan)", len(ht_keys), len(ht_keys), ht_time)):
+            frame = ttk.Frame(result_frame, style="Card.TFrame", padding=10)
+            frame.pack(fill=tk.X, pady=5)
+            ttk.Label(frame, text=f"{title}:", font=("Segoe UI", 11, "bold"),
+                    style='Card.TLabel').pack(anchor='w')
+            ttk.Label(frame, text=f"Matches: {count} ({distinct} distinct)",
+                    style='Card.TLabel').pack(anchor='w')
+            ttk.Label(frame, text=f"Time: {elapsed:.8f} seconds",
+                    font=("Consolas", 10), style='Card.TLabel').pack(anchor='w')
+
+        if bst_time > 0 and ht_time > 0:
+            faster = tree_name if bst_time < ht_time else "Hash Table"
+            factor = max(bst_time, ht_time) / min(bst_time, ht_time)
+            ttk.Separator(result_frame, orient='horizontal').pack(fill=tk.X, pady=10)
+            ttk.Label(result_frame, text=f"{faster} was {factor:.1f}x faster",
+                    font=("Segoe UI", 10, "bold")).pack()
+
+        ttk.Button(result_frame, text="Close", command=result_dialog.destroy).pack(pady=10)
+        self.update_status(f"Range query [{lo}, {hi}]: {bst_count} matches")
+
     def compare_times(self):
         """Compare lookup times between BST and Hash Table across multiple sample sizes"""
         if not self.values:
             messagebox.showwarning("No Data", "Insert values first to compare.")
             return
+        if self.compare_worker is not None:
+            self.update_status("A performance comparison is already running")
+            return
         
         # Clear previous charts
         for widget in self.comp_inner_frame.winfo_children():
@@ -931,46 +3461,225 @@ class App:
         
         # Get the test type selection from the variable
         test_type = self.test_type.get()
+        tree_name = self.tree_backend.get()
+        batched = self.lookup_mode.get() == "Batched"
+        layout = self.lookup_layout.get()
+
+        # The frozen layouts store keys in signed 64-bit slots, which not every tree backend needs
+        if layout in FROZEN_LAYOUTS and not INT64_MIN <= min(self.values) <= max(self.values) <= INT64_MAX:
+            messagebox.showwarning(
+                "Keys Out of Range",
+                f"The {layout} layout only holds keys between {INT64_MIN} and {INT64_MAX}. "
+                'Choose the "Pointer tree" lookup structure to compare these values.'
+            )
+            process_frame.destroy()
+            self.update_status("Comparison aborted: Keys out of range for the frozen layout")
+            return
+
+        # Pick every lookup value up front so the timing never reads self.values
+        workloads = [(size, self.pick_search_values(test_type, size)) for size in available_samples]
+        table = self.ht.copy()
+        # Every hash backend gets the same keys so their tail latencies can be compared side by side;
+        # the empty tables read the Data tab's options here, and are loaded along with the timing
+        stored = list(self.ht)
+        hash_tables = {name: self.make_hash_table(name) for name in HASH_BACKENDS}
+        result = {}
+
+        tree = None
+        if layout in FROZEN_LAYOUTS:
+            # A frozen copy never changes, so it can be timed off the UI thread like a snapshot
+            tree = self.bst.freeze(layout)
+            tree_name = f"{tree_name} ({layout})"
+        elif type(self.bst) is BST:
+            # Inserts made while the worker runs copy their path, so the snapshot needs no locks
+            tree = self.bst.snapshot()
+
+        if tree is not None:
+            self.compare_worker = threading.Thread(
+                target=self.run_comparison_worker,
+                args=(result, tree, table, workloads, batched, hash_tables, stored),
+                daemon=True)
+            self.compare_worker.start()
+            self.root.after(50, self.finish_comparison, result, process_frame, test_type, tree_name, batched)
+        else:
+            # Other backends reshape nodes in place, so they are timed on the UI thread
+            result["stats"] = self.measure_lookups(self.bst, table, workloads, batched, hash_tables, stored)
+            self.show_comparison(result["stats"], process_frame, test_type, tree_name, batched)
+
+    def pick_search_values(self, test_type, sample_size):
+        """Choose the lookup values for one sample size of the selected test type"""
+        if test_type == "Random":
+            return random.sample(self.values, sample_size)
+        elif test_type == "Best-case":
+            # Best-case: Search for the first inserted value
+            return [self.values[0]] * sample_size
+        elif test_type == "Skewed":
+            # Skewed: Zipf-like popularity, the i-th hottest value is weighted 1/i
+            hot_order = list(set(self.values))
+            random.shuffle(hot_order)
+            weights = [1 / rank for rank in range(1, len(hot_order) + 1)]
+            return random.choices(hot_order, weights=weights, k=sample_size)
+        elif test_type == "Worst-case":
+            # Worst-case: Searching for a value known not to exist
+            return [-1] * sample_size
+        return random.sample(self.values, sample_size)
+
+    def measure_lookups(self, tree, table, workloads, batched, hash_tables, stored):
+        """Time tree and hash table lookups for each (sample_size, values) workload; safe off the UI thread
+
+        hash_tables maps backend names to empty tables, which are first loaded with the stored keys;
+        each one's p99 single-lookup latency is reported alongside the averages.
+        """
+        for hash_table in hash_tables.values():
+            for key in stored:
+                hash_table.insert(key)
+
         all_stats = []
-        
-        # Run tests for each available sample size
-        for sample_size in available_samples:
+        for sample_size, search_vals in workloads:
             bst_times = []
             ht_times = []
-            
-            # Select lookup values based on test type
-            if test_type == "Random":
-                search_vals = random.sample(self.values, sample_size)
-            elif test_type == "Best-case":
-                # Best-case: Search for the first inserted value
-                search_vals = [self.values[0]] * sample_size
-            elif test_type == "Worst-case":
-                # Worst-case: Searching for a value known not to exist
-                search_vals = [-1] * sample_size
-            else:
-                search_vals = random.sample(self.values, sample_size)
-            
+
             # Perform searches and measure times
-            for val in search_vals:
-                t1 = time.perf_counter()
-                self.bst.search(val)
-                bst_times.append(time.perf_counter() - t1)
-
-                t2 = time.perf_counter()
-                self.ht.search(val)
-                ht_times.append(time.perf_counter() - t2)
-            
+            if batched:
+                # Time whole batches and record the per-key cost of each repeat
+                for _ in range(self.batch_repeats):
+                    t1 = time.perf_counter()
+                    tree.search_many(search_vals)
+                    bst_times.append((time.perf_counter() - t1) / sample_size)
+
+                    t2 = time.perf_counter()
+                    for val in search_vals:
+                        table.search(val)
+                    ht_times.append((time.perf_counter() - t2) / sample_size)
+            else:
+                for val in search_vals:
+                    t1 = time.perf_counter()
+                    tree.search(val)
+                    bst_times.append(time.perf_counter() - t1)
+
+                    t2 = time.perf_counter()
+                    table.search(val)
+                    ht_times.append(time.perf_counter() - t2)
+
             bst_avg = sum(bst_times) / len(bst_times)
             ht_avg = sum(ht_times) / len(ht_times)
             speedup = bst_avg / ht_avg if ht_avg > 0 else 0
-            
+
+            hash_p99 = {}
+            for name, hash_table in hash_tables.items():
+                lookup_times = []
+                for val in search_vals:
+                    t3 = time.perf_counter()
+                    hash_table.search(val)
+                    lookup_times.append(time.perf_counter() - t3)
+                lookup_times.sort()
+                hash_p99[name] = lookup_times[int(0.99 * (len(lookup_times) - 1))]
+
             all_stats.append({
                 'sample_size': sample_size,
                 'bst_avg': bst_avg,
                 'ht_avg': ht_avg,
-                'speedup': speedup
+                'speedup': speedup,
+                'bst_times': bst_times,
+                'ht_times': ht_times,
+                'hash_p99': hash_p99
             })
-            
+        return all_stats
+
+    def run_comparison_worker(self, result, tree, table, workloads, batched, hash_tables, stored):
+        """Worker thread body: store the lookup stats, or the exception that stopped them"""
+        try:
+            result["stats"] = self.measure_lookups(tree, table, workloads, batched, hash_tables, stored)
+        except Exception as exc:
+            # Tk may only be touched from the UI thread, so finish_comparison reports it
+            result["error"] = exc
+
+    def finish_comparison(self, result, process_frame, test_type, tree_name, batched):
+        """Poll the comparison worker and draw its results once it is done"""
+        if self.compare_worker.is_alive():
+            self.root.after(50, self.finish_comparison, result, process_frame, test_type, tree_name, batched)
+            return
+        self.compare_worker = None
+        if "error" in result:
+            process_frame.destroy()
+            messagebox.showerror("Comparison Failed",
+                                 f"The performance comparison stopped with an error:\n{result['error']!r}")
+            self.update_status("Comparison failed")
+            return
+        self.show_comparison(result["stats"], process_frame, test_type, tree_name, batched)
+
+    def compare_btree_orders(self):
+        """Time loading and searching the current values in B-trees of several orders, a BST and a Hash Table"""
+        if not self.values:
+            messagebox.showwarning("No Data", "Insert values first to compare.")
+            return
+
+        for widget in self.comp_inner_frame.winfo_children():
+            widget.destroy()
+        self.update_status("Timing B-tree orders...")
+        self.root.update()
+
+        probes = random.choices(self.values, k=min(len(self.values), 10000))
+        structures = [("BST", BST()), ("Hash Table", HashTable())]
+        structures += [(f"B-Tree ({order})", BTree(order=order)) for order in BTREE_ORDERS]
+        rows = []
+        for name, structure in structures:
+            t1 = time.perf_counter()
+            for val in self.values:
+                structure.insert(val)
+            insert_rate = len(self.values) / max(time.perf_counter() - t1, 1e-9)
+
+            t2 = time.perf_counter()
+            for val in probes:
+                structure.search(val)
+            lookup_rate = len(probes) / max(time.perf_counter() - t2, 1e-9)
+            levels = structure.levels() if isinstance(structure, BTree) else None
+            rows.append((name, insert_rate, lookup_rate, levels))
+
+        card_frame = ttk.Frame(self.comp_inner_frame, style="Card.TFrame")
+        card_frame.pack(fill=tk.X, padx=20, pady=10)
+        ttk.Label(card_frame, text=f"B-Tree Orders ({len(self.values)} inserts, {len(probes)} lookups)",
+                style="Heading.TLabel").pack(anchor='w', padx=10, pady=10)
+
+        for name, insert_rate, lookup_rate, levels in rows:
+            level_text = f", {levels} levels" if levels is not None else ""
+            ttk.Label(card_frame, text=f"{name:<16} insert {insert_rate:>12,.0f}/s   "
+                                     f"lookup {lookup_rate:>12,.0f}/s{level_text}",
+                    font=("Consolas", 9), style='Card.TLabel').pack(anchor='w', padx=10)
+
+        fig = plt.Figure(figsize=(9, 4), dpi=100)
+        ax = fig.add_subplot(111)
+        chart = FigureCanvasTkAgg(fig, card_frame)
+        chart.get_tk_widget().pack(padx=10, pady=5, fill=tk.X)
+
+        save_btn = ttk.Button(card_frame, text="Save Chart", style="Action.TButton",
+                      command=lambda fig=fig: self.save_chart(fig))
+        save_btn.pack(padx=10, pady=(0, 10), anchor="e")
+
+        width = 0.35
+        x = range(len(rows))
+        ax.bar([i - width/2 for i in x], [row[1] for row in rows], width, label='Inserts/s',
+             color=self.colors["primary"], alpha=0.8)
+        ax.bar([i + width/2 for i in x], [row[2] for row in rows], width, label='Lookups/s',
+             color=self.colors["secondary"], alpha=0.8)
+        ax.set_ylabel('Operations per second')
+        ax.set_title('Throughput by Structure and B-Tree Order')
+        ax.set_xticks(x)
+        ax.set_xticklabels([row[0] for row in rows])
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+        fig.tight_layout()
+
+        self.comp_canvas.configure(scrollregion=self.comp_canvas.bbox("all"))
+        self.update_status(f"Compared B-tree orders {', '.join(map(str, BTREE_ORDERS))}")
+
+    def show_comparison(self, all_stats, process_frame, test_type, tree_name, batched):
+        """Draw a result card per sample size, then the summary chart"""
+        for stat in all_stats:
+            sample_size = stat['sample_size']
+            bst_avg, ht_avg = stat['bst_avg'], stat['ht_avg']
+            bst_times, ht_times = stat['bst_times'], stat['ht_times']
+
             # Create a card for this sample size
             card_frame = ttk.Frame(self.comp_inner_frame, style="Card.TFrame")
             card_frame.pack(fill=tk.X, padx=20, pady=10)
@@ -984,7 +3693,7 @@ class App:
                    style="Heading.TLabel").pack(side=tk.LEFT)
             
             # Efficiency display on the right
-            faster = "Hash Table" if ht_avg < bst_avg else "BST"
+            faster = "Hash Table" if ht_avg < bst_avg else tree_name
             factor = max(bst_avg, ht_avg) / min(bst_avg, ht_avg) if min(bst_avg, ht_avg) > 0 else 0
             
             eff_frame = ttk.Frame(header_frame)
@@ -1005,7 +3714,7 @@ class App:
             bst_stat_frame = ttk.Frame(stats_frame, style='Card.TFrame')
             bst_stat_frame.pack(side=tk.LEFT, padx=10)
             
-            ttk.Label(bst_stat_frame, text="BST Average:",  
+            ttk.Label(bst_stat_frame, text=f"{tree_name} Average:",  
                    font=("Segoe UI", 9), style='Card.TLabel').pack(anchor='w')
             ttk.Label(bst_stat_frame, text=f"{bst_avg:.8f} seconds", 
                    font=("Consolas", 9, "bold"), 
@@ -1021,6 +3730,17 @@ class App:
             ttk.Label(ht_stat_frame, text=f"{ht_avg:.8f} seconds", 
                    font=("Consolas", 9, "bold"), 
                    foreground=self.colors["primary"], style='Card.TLabel').pack(anchor='w')
+
+            # Tail latency of each hash backend on the same lookups
+            p99_frame = ttk.Frame(stats_frame, style='Card.TFrame')
+            p99_frame.pack(side=tk.LEFT, padx=10)
+
+            ttk.Label(p99_frame, text="Hash p99 Lookup:",
+                   font=("Segoe UI", 9), style='Card.TLabel').pack(anchor='w')
+            p99_text = "  ".join(f"{name} {p99 * 1e6:.2f} µs" for name, p99 in stat['hash_p99'].items())
+            ttk.Label(p99_frame, text=p99_text,
+                   font=("Consolas", 9, "bold"),
+                   foreground=self.colors["primary"], style='Card.TLabel').pack(anchor='w')
             
             # Create line plot for the current sample size
             fig = plt.Figure(figsize=(9, 3), dpi=100)
@@ -1033,14 +3753,15 @@ class App:
             save_btn.pack(padx=10, pady=(0, 10), anchor="e")
 
             # Customize the plot appearance
-            ax.plot(bst_times, label='BST', marker='o', markersize=3, 
+            ax.plot(bst_times, label=tree_name, marker='o', markersize=3, 
                  color=self.colors["primary"], alpha=0.8, linewidth=1)
             ax.plot(ht_times, label='Hash Table', marker='x', markersize=3, 
                  color=self.colors["warning"], alpha=0.8, linewidth=1)
             
-            ax.set_xlabel('Search #')
-            ax.set_ylabel('Time (s)')
-            ax.set_title(f'Lookup Performance ({sample_size} searches) - {test_type} test')
+            ax.set_xlabel('Batch #' if batched else 'Search #')
+            ax.set_ylabel('Time per key (s)' if batched else 'Time (s)')
+            mode_suffix = ", batched" if batched else ""
+            ax.set_title(f'Lookup Performance ({sample_size} searches{mode_suffix}) - {test_type} test')
             ax.legend()
             ax.grid(True, alpha=0.3)
             fig.tight_layout()
@@ -1049,11 +3770,11 @@ class App:
         process_frame.destroy()
         
         # Create summary chart if we have multiple sample sizes
-        if len(available_samples) > 1:
+        if len(all_stats) > 1:
             self.create_summary_chart(all_stats)
         
         self.comp_canvas.configure(scrollregion=self.comp_canvas.bbox("all"))
-        self.update_status(f"Completed performance comparison across {len(available_samples)} sample sizes")
+        self.update_status(f"Completed performance comparison across {len(all_stats)} sample sizes")
 
     def create_summary_chart(self, stats):
         """Create a summary chart comparing all sample sizes"""
@@ -1086,7 +3807,8 @@ class App:
         width = 0.35
         x = range(len(sample_sizes))
         
-        bst_bars = ax.bar([i - width/2 for i in x], bst_avgs, width, label='BST', 
+        tree_name = self.tree_backend.get()
+        bst_bars = ax.bar([i - width/2 for i in x], bst_avgs, width, label=tree_name, 
                         color=self.colors["primary"], alpha=0.8)
         ht_bars = ax.bar([i + width/2 for i in x], ht_avgs, width, label='Hash Table', 
                        color=self.colors["warning"], alpha=0.8)
@@ -1114,8 +3836,8 @@ class App:
         ax.grid(axis='y', alpha=0.3)
         
         # Add a note about the results
-        best_for_small = "Hash Table" if ht_avgs[0] < bst_avgs[0] else "BST"
-        best_for_large = "Hash Table" if ht_avgs[-1] < bst_avgs[-1] else "BST"
+        best_for_small = "Hash Table" if ht_avgs[0] < bst_avgs[0] else tree_name
+        best_for_large = "Hash Table" if ht_avgs[-1] < bst_avgs[-1] else tree_name
         
         note_text = (f"• For small samples ({sample_sizes[0]} searches), {best_for_small} performed better.\n"
                    f"• For large samples ({sample_sizes[-1]} searches), {best_for_large} performed better.")
@@ -1129,7 +3851,14 @@ class App:
         complexity_text = (
             "Time Complexity:\n"
             "• BST: O(log n) average case, O(n) worst case (unbalanced tree)\n"
-            "• Hash Table: O(1) average case, O(n) worst case (many collisions)"
+            "• AVL Tree: O(log n) worst case (height ≤ 1.44 log n)\n"
+            "• Red-Black Tree: O(log n) worst case (height ≤ 2 log n)\n"
+            "• Scapegoat Tree: O(log n) worst case, O(log n) amortized insert\n"
+            "• Splay Tree: O(log n) amortized, repeated/hot keys close to O(1)\n"
+            "• B-Tree: O(log n) worst case in about log_m(n) node hops (order m)\n"
+            "• Hash Table: O(1) average case, O(n) worst case (many collisions)\n"
+            "• Quadratic / Double Hashing: break up the clusters linear probing builds on patterned keys\n"
+            "• Cuckoo Hash Table: O(1) worst-case lookup (one slot per table plus a small stash)"
         )
         
         ttk.Label(summary_frame, text=complexity_text, 
@@ -1142,21 +3871,28 @@ class App:
         """
         # 1) In-order pass to give every node a unique leaf index
         in_index = {}
-        counter = {'x': 0}
-        def _inorder(n):
-            if not n: return
-            _inorder(n.left)
-            in_index[n] = counter['x']
-            counter['x'] += 1
-            _inorder(n.right)
-        _inorder(self.bst.root)
+        stack = []
+        n = self.bst.root
+        while stack or n:
+            if n:
+                stack.append(n)
+                n = n.left
+            else:
+                n = stack.pop()
+                in_index[n] = len(in_index)
+                n = n.right
 
         # 2) Post-order pass to compute final x as midpoint of children (or leaf index)
         positions = {}
-        def _assign(n, depth=0):
-            if not n: return
-            _assign(n.left, depth+1)
-            _assign(n.right, depth+1)
+        stack = [(self.bst.root, 0, False)] if self.bst.root else []
+        while stack:
+            n, depth, children_done = stack.pop()
+            if not children_done:
+                stack.append((n, depth, True))
+                for child in (n.left, n.right):
+                    if child:
+                        stack.append((child, depth+1, False))
+                continue
             if n.left and n.right:
                 x = (positions[n.left][0] + positions[n.right][0]) / 2
             elif n.left:
@@ -1166,7 +3902,6 @@ class App:
             else:
                 x = in_index[n]
             positions[n] = (x, depth)
-        _assign(self.bst.root, 0)
         return positions
     
     def draw_visuals(self):
@@ -1202,12 +3937,18 @@ class App:
             for node, (col, depth) in node_pos.items():
                 x, y = x_offset + col*h_spacing, y_offset + depth*v_spacing
                 node_size = max(15*self.bst_zoom, 5)
+                # Red-black nodes are drawn in their own colour instead of the 3D blue
+                is_red = getattr(node, "is_red", None)
+                if is_red is None:
+                    fill = self.colors["primary"]
+                else:
+                    fill = self.colors["warning"] if is_red else self.colors["dark_bg"]
                 # circle
                 self.canvas.create_oval(x-node_size, y-node_size,
                                         x+node_size, y+node_size,
-                                        fill=self.colors["primary"], outline="",
+                                        fill=fill, outline="",
                                         tags=(self.tree_tag,))
-                if not self.simple_render:
+                if not self.simple_render and is_red is None:
                     self.canvas.create_arc(x-node_size, y-node_size,
                                            x+node_size, y-node_size+node_size*2,
                                            start=45, extent=180, fill="#3b77db", outline="",
@@ -1226,12 +3967,8 @@ class App:
 
     def update_bst_info_panel(self):
         """Update the BST information panel"""
-        def count_nodes(node):
-            if not node:
-                return 0
-            return 1 + count_nodes(node.left) + count_nodes(node.right)
-        
-        total_nodes = count_nodes(self.bst.root)
+        # Nodes, not keys: in multiset mode one node holds every copy of its key
+        total_nodes = sum(self.bst.depth_histogram())
         visible_nodes = self.count_visible_nodes()
         max_depth = self.max_depth_var.get()
         
@@ -1248,15 +3985,12 @@ class App:
     def count_visible_nodes(self):
         """Count nodes that are within the current depth limit"""
         max_depth = self.max_depth_var.get()
+        depths = self.bst.depth_histogram()
         if max_depth == 0:
-            return len(self.values)
+            return sum(depths)
         
-        def count_to_depth(node, current_depth=0):
-            if not node or (max_depth > 0 and current_depth > max_depth):
-                return 0
-            return 1 + count_to_depth(node.left, current_depth+1) + count_to_depth(node.right, current_depth+1)
-    
-        return count_to_depth(self.bst.root)
+        # Depths 0..max_depth straight from the tree's depth histogram
+        return sum(depths[:max_depth + 1])
 
     def draw_tree(self, node, x, y, offset, current_depth=0):
         """Draw the BST on the canvas; in large mode skip 3D effects."""
@@ -1297,6 +4031,11 @@ class App:
         
     def draw_hashtable(self):
         self.hash_canvas.delete("all")
+        if isinstance(self.ht, CuckooHashTable):
+            self.draw_cuckoo_tables()
+            return
+        # The drawing shows a single table, so let an incremental resize finish first
+        self.ht.finish_resize()
         row_height = 40
         header_height = 50
 
@@ -1308,7 +4047,7 @@ class App:
         # Find the widest bucket contents
         for i in range(visible_buckets):
             bucket = self.ht.table[i]
-            items_text = str(bucket) if bucket is not None else "(empty)"
+            items_text = "(deleted)" if bucket is _DELETED else str(bucket) if bucket is not None and bucket != [] else "(empty)"
             text_width = font_bucket.measure(items_text)
             max_text_width = max(max_text_width, text_width)
 
@@ -1330,7 +4069,8 @@ class App:
         self.hash_canvas.create_text(150 + (table_width-150)/2, 50 + header_height/2, 
             text="Value", fill="white", font=("Segoe UI", 12, "bold"))
 
-        non_empty = sum(1 for bucket in self.ht.table[:visible_buckets] if bucket is not None)
+        non_empty = sum(1 for bucket in self.ht.table[:visible_buckets]
+                        if bucket is not None and bucket is not _DELETED and bucket != [])
 
         row = 0
         y_start = 50 + header_height
@@ -1342,7 +4082,7 @@ class App:
             self.hash_canvas.create_rectangle(50, y_pos, 50 + table_width, y_pos + row_height, fill=bg_color, outline="#e0e0e0")
             self.hash_canvas.create_rectangle(50, y_pos, 150, y_pos + row_height, fill="#e6e6e6", outline="#d0d0d0")
             self.hash_canvas.create_text(100, y_pos + row_height/2, text=str(i), font=("Consolas", 11, "bold"))
-            items_text = str(bucket) if bucket is not None else "(empty)"
+            items_text = "(deleted)" if bucket is _DELETED else str(bucket) if bucket is not None and bucket != [] else "(empty)"
             self.hash_canvas.create_text(160, y_pos + row_height/2, text=items_text, anchor="w", font=("Segoe UI", 10), tags=f"items_{i}")
             row += 1
 
@@ -1350,30 +4090,103 @@ class App:
         stats_y = y_start + row * row_height + 20
         self.hash_canvas.create_text(50, stats_y, text=f"Total buckets: {self.ht.size}", anchor="w", font=("Segoe UI", 10))
         self.hash_canvas.create_text(50, stats_y + 20, text=f"Non-empty buckets: {non_empty} ({non_empty/self.ht.size*100:.1f}%)", anchor="w", font=("Segoe UI", 10))
-        load_factor = len([v for v in self.ht.table if v is not None]) / self.ht.size
+        load_factor = len(self.ht) / self.ht.size
         self.hash_canvas.create_text(350, stats_y, text=f"Load factor: {load_factor:.2f}", anchor="w", font=("Segoe UI", 10))
         self.hash_canvas.configure(scrollregion=(0, 0, table_width + 100, total_height))
 
+    def draw_cuckoo_tables(self):
+        """Draw a cuckoo hash table: one value column per table, then the stash"""
+        row_height = 40
+        header_height = 50
+        column_width = 160
+        ways = self.ht.ways
+        table_width = 100 + column_width * ways
+
+        self.hash_canvas.create_text(50 + table_width/2, 20,
+            text="Cuckoo Hash Table Visualization",
+            fill=self.colors["text"],
+            font=("Segoe UI", 14, "bold"))
+
+        self.hash_canvas.create_rectangle(50, 50, 50 + table_width, 50 + header_height,
+            fill=self.colors["primary"], outline="")
+        self.hash_canvas.create_text(100, 50 + header_height/2,
+            text="Index", fill="white", font=("Segoe UI", 12, "bold"))
+        for way in range(ways):
+            x = 150 + way * column_width
+            self.hash_canvas.create_line(x, 50, x, 50 + header_height, fill="white", width=2)
+            self.hash_canvas.create_text(x + column_width/2, 50 + header_height/2,
+                text=f"Table {way + 1}", fill="white", font=("Segoe UI", 12, "bold"))
+
+        y_start = 50 + header_height
+        for i in range(self.ht.slots):
+            y_pos = y_start + i * row_height
+            bg_color = "#f8f8f8" if i % 2 == 0 else "white"
+            self.hash_canvas.create_rectangle(50, y_pos, 50 + table_width, y_pos + row_height, fill=bg_color, outline="#e0e0e0")
+            self.hash_canvas.create_rectangle(50, y_pos, 150, y_pos + row_height, fill="#e6e6e6", outline="#d0d0d0")
+            self.hash_canvas.create_text(100, y_pos + row_height/2, text=str(i), font=("Consolas", 11, "bold"))
+            for way in range(ways):
+                key = self.ht.tables[way][i]
+                self.hash_canvas.create_text(160 + way * column_width, y_pos + row_height/2,
+                    text=str(key) if key is not None else "(empty)", anchor="w", font=("Segoe UI", 10))
+
+        stats_y = y_start + self.ht.slots * row_height + 20
+        stash_text = ", ".join(map(str, self.ht.stash)) or "(empty)"
+        self.hash_canvas.create_text(50, stats_y, text=f"Stash: {stash_text}", anchor="w", font=("Segoe UI", 10))
+        self.hash_canvas.create_text(50, stats_y + 20,
+            text=f"Total slots: {self.ht.size} ({ways} x {self.ht.slots}), rehashes: {self.ht.rehashes}",
+            anchor="w", font=("Segoe UI", 10))
+        self.hash_canvas.create_text(350, stats_y, text=f"Load factor: {len(self.ht) / self.ht.size:.2f}",
+            anchor="w", font=("Segoe UI", 10))
+        self.hash_canvas.configure(scrollregion=(0, 0, table_width + 100, stats_y + 60))
+
     def update_stats(self):
         """Update statistics display"""
         # Calculate BST height
-        def get_height(node):
-            if not node:
-                return 0
-            return max(get_height(node.left), get_height(node.right)) + 1
-        
-        height = get_height(self.bst.root)
+        height = self.bst.height()
         count = len(self.values)
         
         # Create more detailed stats
         stats_text = (f"Total Items: {count}\n"
+                    f"Tree Backend: {self.tree_backend.get()}\n"
                     f"BST Height: {height}\n"
+                    f"BST Bytes/Node: {self.bst.bytes_per_node()}\n"
                     f"BST Theoretical Min Height: {int(max(0, count).bit_length())}\n"
-                    f"Hash Table Size: {self.ht.size}\n"
-                    f"Hash Table Load Factor: {count/self.ht.size:.2f}")
+                    f"{self.rebalance_stats()}"
+                    f"{self.skip_list_stats()}"
+                    f"{self.btree_stats()}"
+                    f"Hash Table Backend: {self.hash_backend.get()}{self.probing_stats()}\n"
+                    f"Hash Table Size: {self.ht.size} ({self.ht.resizes} resizes)\n"
+                    f"Hash Table Load Factor: {len(self.ht)/self.ht.size:.2f} "
+                    f"(max {self.ht.max_load}, avg probe {self.ht.average_probe_length():.2f})")
         
         self.stats_label.config(text=stats_text)
 
+    def probing_stats(self):
+        """Probe sequence and tombstone count, for the open addressing backend"""
+        if not isinstance(self.ht, HashTable):
+            return ""
+        return f" ({self.probing_var.get()} probing, {self.ht.tombstones} tombstones)"
+
+    def skip_list_stats(self):
+        """Stats line for the skip list backend: mean tower height and memory per key"""
+        if not isinstance(self.bst, SkipList):
+            return ""
+        return (f"Skip List Avg Tower Height: {self.bst.average_tower_height():.2f} "
+                f"(p={self.bst.p}), {self.bst.bytes_per_node()} B/key\n")
+
+    def btree_stats(self):
+        """Stats line for the B-tree backend: order and node count (its height is the node levels)"""
+        if not isinstance(self.bst, BTree):
+            return ""
+        return f"B-Tree Order: {self.bst.order}, {self.bst.nodes:,} nodes\n"
+
+    def rebalance_stats(self):
+        """One stats line describing the auto-rebalance policy and how often it has fired"""
+        if type(self.bst) is not BST:
+            return "Auto-Rebalance: n/a for this backend\n"
+        return (f"Auto-Rebalance: {self.rebalance_policy.get()}, fired {self.bst.auto_rebalances}x "
+                f"({self.bst.auto_rebalance_seconds * 1000:.1f} ms)\n")
+
     def reset_all(self):
         """Clear all data structures and visualizations"""
         # Ask for confirmation
@@ -1408,6 +4221,12 @@ class App:
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter an integer to search for.")
             return
+        if not isinstance(self.ht, HashTable):
+            messagebox.showinfo("Simulation", "The lookup animation replays open addressing probes. "
+                                "Switch the hash table backend to Open Addressing to run it.")
+            return
+        # The animation replays probes over one table, so let an incremental resize finish first
+        self.ht.finish_resize()
 
         # Create simulation window with modern styling
         sim_window = tk.Toplevel(self.root)
@@ -1639,7 +4458,7 @@ class App:
 
         for i in range(visible_buckets):
             bucket = self.ht.table[i]
-            items_text = str(bucket) if bucket is not None else "(empty)"
+            items_text = "(deleted)" if bucket is _DELETED else str(bucket) if bucket is not None else "(empty)"
             text_width = font_bucket.measure(items_text)
             max_text_width = max(max_text_width, text_width)
 
@@ -1660,7 +4479,7 @@ class App:
             canvas.create_rectangle(table_x, y_pos, table_x + table_width, y_pos + row_height, fill=bg_color, outline="#dddddd", tags=f"bucket_{i}")
             canvas.create_rectangle(table_x, y_pos, table_x + 50, y_pos + row_height, fill="#e6e6e6", outline="#dddddd")
             canvas.create_text(table_x + 25, y_pos + row_height/2, text=str(i), font=("Segoe UI", 10), tags=f"index_{i}")
-            items_text = str(bucket) if bucket is not None else "(empty)"
+            items_text = "(deleted)" if bucket is _DELETED else str(bucket) if bucket is not None else "(empty)"
             canvas.create_text(table_x + 70, y_pos + row_height/2, text=items_text, anchor="w", font=("Segoe UI", 10), tags=f"items_{i}")
 
         total_height = table_y + (visible_buckets + 1) * row_height + 300
@@ -1800,19 +4619,20 @@ class App:
                         font=font3, fill="#555555", tags="result_card")
     
     def animate_hash_search(self, key, canvas, delay):
-        """Animate the hash table search process with linear probing"""
+        """Animate the hash table search process along the table's probe sequence"""
         hash_value = key % self.ht.size
         n = self.ht.size
+        sequence = list(self.ht.probing(key, n))
         row_height = 40
         table_y = 100
 
         def probe(i):
-            idx = (hash_value + i) % n
+            idx = sequence[i]
             # Highlight current bucket
             canvas.itemconfig(f"bucket_{idx}", fill="#ffe0b2")
             canvas.itemconfig(f"index_{idx}", fill="#ff9800")
             if i > 0:
-                prev_idx = (hash_value + i - 1) % n
+                prev_idx = sequence[i - 1]
                 canvas.itemconfig(f"bucket_{prev_idx}", fill="#f0f0f0" if prev_idx % 2 == 0 else "#ffffff")
                 canvas.itemconfig(f"index_{prev_idx}", fill="#202124")
 
@@ -1836,7 +4656,7 @@ class App:
             card_x = (x0 + x1) / 2
             card_y = y1 - card_height / 2 - 80  # 80px from bottom to avoid overlap with compare card
 
-            formula_text = f"Hash formula: h({key}) = {key} % {self.ht.size} = {hash_value}"
+            formula_text = f"h({key}) = {key} % {n} = {hash_value}, probe {i + 1}: bucket {idx}"
             canvas.create_rectangle(card_x - card_width / 2, card_y - card_height / 2,
                                     card_x + card_width / 2, card_y + card_height / 2,
                                     fill="#e3f2fd", outline="#90caf9", width=1, tags="formula_card")
@@ -1847,7 +4667,8 @@ class App:
             canvas.delete("compare_text_card")
             card_y2 = y1 - card_height / 2 - 10
             compare_val = self.ht.table[idx]
-            compare_text = f"Comparing {key} with {compare_val if compare_val is not None else '(empty)'} at bucket {idx}"
+            compare_val = "(deleted)" if compare_val is _DELETED else compare_val if compare_val is not None else "(empty)"
+            compare_text = f"Comparing {key} with {compare_val} at bucket {idx}"
             canvas.create_rectangle(card_x - card_width / 2, card_y2 - card_height / 2,
                                     card_x + card_width / 2, card_y2 + card_height / 2,
                                     fill="#f5f5f5", outline="#dadce0", width=1, tags="compare_text_card")
@@ -1969,6 +4790,7 @@ class App:
         
         added_count = 0
         canceled = False
+        new_values = []
         
         for i in range(0, total_items, batch_size):
             # Check if canceled
@@ -1976,13 +4798,12 @@ class App:
                 canceled = True
                 break
                 
-            # Process a batch of items
-            for _ in range(min(batch_size, total_items - i)):
-                val = random.randint(1, 50000)  # Larger range to reduce duplicates
-                self.values.append(val)
-                self.bst.insert(val)
+            # Process a batch of items; the tree gets all of them at once after the loop
+            batch = [random.randint(1, 50000) for _ in range(min(batch_size, total_items - i))]  # Larger range to reduce duplicates
+            new_values.extend(batch)
+            for val in batch:
                 self.ht.insert(val)
-                added_count += 1
+            added_count += len(batch)
             
             # Update progress
             progress_var.set(added_count / total_items * 100)
@@ -1991,6 +4812,15 @@ class App:
             # Update progress window
             progress_window.update()
         
+        # A balanced rebuild merges every stored key, so it only pays off when the new keys
+        # are at least as many as the ones already in the tree
+        self.values.extend(new_values)
+        if len(new_values) >= len(self.bst):
+            self.bst.bulk_insert(new_values)
+        else:
+            for val in new_values:
+                self.bst.insert(val)
+
         # Close progress window
         progress_window.destroy()
         
@@ -2007,6 +4837,146 @@ class App:
             messagebox.showinfo("Data Added", 
                              f"Successfully added 10,000 random values.\nTotal items: {len(self.values)}")
             self.update_status(f"Added 10,000 random values. Total items: {len(self.values)}")
+    def set_tree_backend(self, event=None):
+        """Swap the tree implementation and reload the current values into it"""
+        name = self.tree_backend.get()
+        self.update_status(f"Switching tree backend to {name}...")
+        counted = self.backend_counts_duplicates(name)
+        previous = self.bst
+        if counted:
+            self.bst = TREE_BACKENDS[name](multiset=self.multiset_var.get())
+        else:
+            self.bst = TREE_BACKENDS[name]()
+        self.set_rebalance_policy(refresh=False)
+        try:
+            for val in self.values:
+                self.bst.insert(val)
+        except ValueError as e:
+            # Keep the previous tree, which already holds every value
+            self.bst = previous
+            self.tree_backend.set(self.active_tree_backend)
+            messagebox.showerror("Backend Unavailable", f"Cannot switch to {name}: {e}")
+            self.update_status(f"Kept tree backend {self.active_tree_backend}")
+            return
+        self.active_tree_backend = name
+        self.multiset_check.state(["!disabled"] if counted else ["disabled"])
+        self.update_stats()
+        self.draw_visuals()
+        if not counted and self.multiset_var.get():
+            self.update_status(f"Tree backend set to {name} ({len(self.values)} values reloaded); it stores "
+                               f"duplicates as repeated keys, so 'Count duplicate keys' does not apply")
+        else:
+            self.update_status(f"Tree backend set to {name} ({len(self.values)} values reloaded)")
+
+    @staticmethod
+    def backend_counts_duplicates(name):
+        """Whether the named tree backend has a multiset mode (the skip list and B-trees don't)"""
+        backend = TREE_BACKENDS[name]
+        # The B-tree entries are partials fixing the order
+        backend = getattr(backend, "func", backend)
+        return not issubclass(backend, (SkipList, BTree))
+
+    def make_hash_table(self, name):
+        """Create an empty hash table of the named backend with the Data tab's options"""
+        if HASH_BACKENDS[name] is HashTable:
+            return HashTable(max_load=HASH_MAX_LOADS[self.max_load_var.get()],
+                             incremental=self.incremental_resize_var.get(),
+                             robin_hood=self.robin_hood_var.get(),
+                             probing=PROBE_STRATEGIES[self.probing_var.get()])
+        return HASH_BACKENDS[name]()
+
+    def set_hash_backend(self, event=None):
+        """Rebuild the hash table with the selected backend and reload the current values"""
+        name = self.hash_backend.get()
+        self.ht = self.make_hash_table(name)
+        for val in self.values:
+            self.ht.insert(val)
+        self.update_stats()
+        self.draw_visuals()
+        self.update_status(f"Hash table backend set to {name} ({len(self.ht)} keys reloaded)")
+
+    def open_addressing_only(self, option):
+        """Report and return True when option can't apply because another hash backend is active"""
+        if isinstance(self.ht, HashTable):
+            return False
+        self.update_status(f"{option} only applies to the Open Addressing backend; it will be used when you switch back")
+        return True
+
+    def set_hash_max_load(self, event=None):
+        """Apply the selected maximum load factor, growing the hash table now if it is already past it"""
+        if self.open_addressing_only("Max load"):
+            return
+        self.ht.set_max_load(HASH_MAX_LOADS[self.max_load_var.get()])
+        self.update_stats()
+        self.draw_visuals()
+        self.update_status(f"Hash table max load set to {self.max_load_var.get()} ({self.ht.size} buckets)")
+
+    def toggle_incremental_resize(self):
+        """Switch the hash table between blocking and incremental resizing"""
+        if self.open_addressing_only("Incremental resizing"):
+            return
+        self.ht.incremental = self.incremental_resize_var.get()
+        if not self.ht.incremental:
+            self.ht.finish_resize()
+        mode = "incremental" if self.ht.incremental else "blocking"
+        self.update_status(f"Hash table resizing is now {mode}")
+
+    def set_probing(self, event=None):
+        """Rehash the open addressing table with the selected probe sequence"""
+        name = self.probing_var.get()
+        if self.robin_hood_var.get() and name != "Linear":
+            self.probing_var.set("Linear")
+            self.update_status("Robin Hood hashing needs the Linear probe sequence; turn it off first")
+            return
+        if self.open_addressing_only("Probe sequence"):
+            return
+        self.ht.set_probing(PROBE_STRATEGIES[name])
+        self.update_stats()
+        self.draw_visuals()
+        self.update_status(f"Hash table now uses {name.lower()} probing ({self.ht.size} buckets)")
+
+    def toggle_robin_hood(self):
+        """Switch the hash table between plain linear probing and Robin Hood probing"""
+        if self.robin_hood_var.get() and self.probing_var.get() != "Linear":
+            self.robin_hood_var.set(False)
+            self.update_status("Robin Hood hashing needs the Linear probe sequence")
+            return
+        if self.open_addressing_only("Robin Hood hashing"):
+            return
+        self.ht.set_robin_hood(self.robin_hood_var.get())
+        self.update_stats()
+        self.draw_visuals()
+        mode = "Robin Hood" if self.ht.robin_hood else "linear"
+        self.update_status(f"Hash table now uses {mode} probing")
+
+    def set_rebalance_policy(self, event=None, refresh=True):
+        """Apply the selected automatic rebalancing policy to the tree, if the backend supports one"""
+        if type(self.bst) is not BST:
+            return
+        self.bst.set_rebalance_policy(**REBALANCE_POLICIES[self.rebalance_policy.get()])
+        if refresh:
+            self.update_stats()
+            self.update_status(f"Auto-rebalance policy set to {self.rebalance_policy.get()}")
+
+    def export_sorted_keys(self):
+        """Stream the tree's keys to a text file in sorted order"""
+        if not self.values:
+            messagebox.showwarning("No Data", "Insert values first to export.")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text File", "*.txt"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        # Iterating the tree yields keys lazily, so no sorted copy of the data is built
+        written = 0
+        with open(file_path, "w") as f:
+            for key in self.bst:
+                f.write(f"{key}\n")
+                written += 1
+        self.update_status(f"Exported {written} keys to {file_path}")
+
     def balance_tree(self):
         """Balance the Binary Search Tree."""
         self.bst.balance()